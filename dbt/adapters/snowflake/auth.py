@@ -1,20 +1,22 @@
 import base64
-import sys
-from typing import Optional
-
-if sys.version_info < (3, 9):
-    from functools import lru_cache
-
-    cache = lru_cache(maxsize=None)
-else:
-    from functools import cache
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import monotonic
+from typing import Callable, Optional, Tuple
 
 from cryptography.hazmat.backends import default_backend
 from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
 
 
-@cache
+# the number of keys kept by PRIVATE_KEY_CACHE and the seconds each is kept for
+PRIVATE_KEY_CACHE_SIZE = 16
+PRIVATE_KEY_CACHE_TTL_SECONDS = 3600.0
+
+
 def private_key_from_string(
     private_key_string: str, passphrase: Optional[str] = None
 ) -> RSAPrivateKey:
@@ -37,7 +39,6 @@ def private_key_from_string(
     )
 
 
-@cache
 def private_key_from_file(
     private_key_path: str, passphrase: Optional[str] = None
 ) -> RSAPrivateKey:
@@ -55,3 +56,90 @@ def private_key_from_file(
         password=encoded_passphrase,
         backend=default_backend(),
     )
+
+
+def snowflake_private_key(private_key: RSAPrivateKey) -> bytes:
+    return private_key.private_bytes(
+        encoding=serialization.Encoding.DER,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+
+
+@dataclass
+class PrivateKeyCacheStats:
+    # lookups that returned a cached key
+    hits: int = 0
+    # lookups that had to load and decrypt the key
+    misses: int = 0
+
+
+class PrivateKeyCache:
+    """The unencrypted DER bytes of the private keys used to connect, so a key is loaded and
+    decrypted once rather than on every connection open.
+
+    Entries are keyed by a digest of the key and its passphrase, or of the path and passphrase
+    for key files, so neither is kept in memory by the cache. A key file is loaded again when
+    its modification time changes, which lets keys be rotated without restarting, and every
+    entry is loaded again after `ttl` seconds. At most `maxsize` keys are kept, the least
+    recently used are dropped first.
+    """
+
+    def __init__(
+        self, maxsize: int = PRIVATE_KEY_CACHE_SIZE, ttl: float = PRIVATE_KEY_CACHE_TTL_SECONDS
+    ) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # the DER bytes of each key, the modification time of its file and when it expires
+        self._keys: "OrderedDict[str, Tuple[bytes, Optional[int], float]]" = OrderedDict()
+        self.stats = PrivateKeyCacheStats()
+
+    def from_string(self, private_key_string: str, passphrase: Optional[str] = None) -> bytes:
+        return self._get(
+            self._digest("string", private_key_string, passphrase),
+            None,
+            lambda: private_key_from_string(private_key_string, passphrase),
+        )
+
+    def from_file(self, private_key_path: str, passphrase: Optional[str] = None) -> bytes:
+        return self._get(
+            self._digest("file", os.path.abspath(private_key_path), passphrase),
+            os.stat(private_key_path).st_mtime_ns,
+            lambda: private_key_from_file(private_key_path, passphrase),
+        )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys.clear()
+
+    def _get(self, key: str, mtime: Optional[int], load: Callable[[], RSAPrivateKey]) -> bytes:
+        with self._lock:
+            cached = self._keys.get(key)
+            if cached is not None and cached[1] == mtime and monotonic() < cached[2]:
+                self._keys.move_to_end(key)
+                self.stats.hits += 1
+                return cached[0]
+            self.stats.misses += 1
+
+        # load outside the lock, decrypting a key is slow and other keys can be used meanwhile
+        der = snowflake_private_key(load())
+        with self._lock:
+            self._keys[key] = (der, mtime, monotonic() + self.ttl)
+            self._keys.move_to_end(key)
+            while len(self._keys) > self.maxsize:
+                self._keys.popitem(last=False)
+        return der
+
+    @staticmethod
+    def _digest(kind: str, value: str, passphrase: Optional[str]) -> str:
+        digest = hashlib.sha256()
+        for part in (kind, value, passphrase or ""):
+            digest.update(part.encode())
+            # separate the parts, so they can't run into each other
+            digest.update(b"\0")
+        return digest.hexdigest()
+
+
+# shared by every connection in the process
+PRIVATE_KEY_CACHE = PrivateKeyCache()
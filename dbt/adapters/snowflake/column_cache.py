@@ -0,0 +1,48 @@
+import threading
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from dbt.adapters.snowflake.column import SnowflakeColumn
+
+
+# database, schema and identifier, the way Snowflake stores them
+ColumnCacheKey = Tuple[Optional[str], Optional[str], Optional[str]]
+
+
+class ColumnCache:
+    """The columns of the relations described during a run.
+
+    Entries are dropped by the identifier of any relation a statement creates, alters or
+    drops, whatever its database and schema, so a relation is described again once its
+    columns may have changed.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._columns: Dict[ColumnCacheKey, List[SnowflakeColumn]] = {}
+        # bumped on every invalidation, so a describe that ran at the same time as a
+        # statement that changed the relation is never stored
+        self._generation = 0
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, key: ColumnCacheKey) -> Optional[List[SnowflakeColumn]]:
+        with self._lock:
+            columns = self._columns.get(key)
+        return None if columns is None else list(columns)
+
+    def set(self, key: ColumnCacheKey, columns: List[SnowflakeColumn], generation: int) -> None:
+        with self._lock:
+            if generation == self._generation:
+                self._columns[key] = list(columns)
+
+    def invalidate(self, identifiers: Optional[FrozenSet[str]]) -> None:
+        """Drop the relations with any of the identifiers, or every relation for None."""
+        with self._lock:
+            self._generation += 1
+            if identifiers is None:
+                self._columns.clear()
+                return
+            for key in [key for key in self._columns if key[2] in identifiers]:
+                del self._columns[key]
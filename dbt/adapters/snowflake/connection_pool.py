@@ -0,0 +1,182 @@
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from time import monotonic
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from dbt.adapters.events.logging import AdapterLogger
+
+
+logger = AdapterLogger("Snowflake")
+
+# sessions idle for less than this are reused without a heartbeat, they were just used
+HEARTBEAT_AFTER_IDLE_SECONDS = 10.0
+# sessions opened at once by prewarm()
+PREWARM_MAX_CONCURRENCY = 8
+# seconds checkout() waits for sessions being prewarmed before it lets the caller open one,
+# logins can hang, e.g. on an SSO prompt or MFA push nobody answers
+PREWARM_MAX_WAIT_SECONDS = 30.0
+
+
+@dataclass
+class ConnectionPoolStats:
+    # checkouts that reused an open session
+    hits: int = 0
+    # checkouts that found no session to reuse, so a new one was opened
+    misses: int = 0
+    # sessions closed because they were idle for too long or failed their heartbeat
+    evictions: int = 0
+    # time spent opening the sessions of misses
+    open_seconds: float = 0.0
+    # sessions opened ahead of time by prewarm()
+    prewarmed: int = 0
+
+    def __str__(self) -> str:
+        average = self.open_seconds / self.misses if self.misses else 0.0
+        return (
+            f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions, "
+            f"{self.prewarmed} prewarmed, {average:.2f}s average open time"
+        )
+
+
+class SnowflakeConnectionPool:
+    """Open Snowflake sessions that no thread is using, shared by every thread in the process.
+
+    Sessions are checked in with the key of the credentials that opened them and only checked
+    out for the same key, most recently used first. A session that was idle for a while is
+    sent a heartbeat before it is reused, and one that was idle for longer than its timeout
+    is closed the next time the pool is used.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # notified when a session being prewarmed is checked in or fails to open
+        self._prewarmed = threading.Condition(self._lock)
+        # the idle handles of each key with the time they expire, oldest first
+        self._idle: Dict[Hashable, List[Tuple[Any, float, float]]] = {}
+        # the number of sessions being prewarmed for each key
+        self._opening: Dict[Hashable, int] = {}
+        self.stats = ConnectionPoolStats()
+
+    def checkout(self, key: Hashable, timeout: float = PREWARM_MAX_WAIT_SECONDS) -> Optional[Any]:
+        """Return an open handle for the key, or None if a new one has to be opened. Waits
+        up to `timeout` seconds for sessions that are being prewarmed for the key rather than
+        opening another one."""
+        deadline = monotonic() + timeout
+        while True:
+            with self._lock:
+                while not self._idle.get(key) and self._opening.get(key):
+                    remaining = deadline - monotonic()
+                    if remaining <= 0:
+                        break
+                    self._prewarmed.wait(remaining)
+                expired = self._pop_expired()
+                idle = self._idle.get(key)
+                handle, returned_at, _ = idle.pop() if idle else (None, 0.0, 0.0)
+            self._close(expired)
+            if handle is None:
+                with self._lock:
+                    self.stats.misses += 1
+                return None
+            if monotonic() - returned_at < HEARTBEAT_AFTER_IDLE_SECONDS or self._is_valid(handle):
+                with self._lock:
+                    self.stats.hits += 1
+                return handle
+            with self._lock:
+                self.stats.evictions += 1
+            self._close([handle])
+
+    def checkin(self, key: Hashable, handle: Any, idle_timeout: float) -> None:
+        now = monotonic()
+        with self._lock:
+            self._idle.setdefault(key, []).append((handle, now, now + idle_timeout))
+            expired = self._pop_expired()
+        self._close(expired)
+
+    def prewarm(
+        self, key: Hashable, open_handle: Callable[[], Any], count: int, idle_timeout: float
+    ) -> None:
+        """Open `count` sessions for the key in the background and check them in, at most
+        PREWARM_MAX_CONCURRENCY at a time. Sessions that fail to open are skipped."""
+        if count <= 0:
+            return
+        with self._lock:
+            self._opening[key] = self._opening.get(key, 0) + count
+
+        def open_one() -> None:
+            try:
+                handle = open_handle()
+            except Exception as e:
+                logger.debug(f"Could not prewarm a Snowflake session: {e}")
+                handle = None
+            with self._lock:
+                self._opening[key] -= 1
+                if not self._opening[key]:
+                    del self._opening[key]
+                if handle is not None:
+                    now = monotonic()
+                    self._idle.setdefault(key, []).append((handle, now, now + idle_timeout))
+                    self.stats.prewarmed += 1
+                self._prewarmed.notify_all()
+
+        prewarm_executor = ThreadPoolExecutor(
+            max_workers=min(count, PREWARM_MAX_CONCURRENCY),
+            thread_name_prefix="snowflake-prewarm",
+        )
+        for _ in range(count):
+            # run with the caller's context, e.g. the invocation context of dbt
+            prewarm_executor.submit(contextvars.copy_context().run, open_one)
+        prewarm_executor.shutdown(wait=False)
+
+    def record_open(self, seconds: float) -> None:
+        with self._lock:
+            self.stats.open_seconds += seconds
+
+    def close_all(self) -> None:
+        with self._lock:
+            handles = [handle for idle in self._idle.values() for handle, _, _ in idle]
+            self._idle.clear()
+        self._close(handles)
+
+    def _pop_expired(self) -> List[Any]:
+        now = monotonic()
+        expired: List[Any] = []
+        for key, idle in list(self._idle.items()):
+            kept = [entry for entry in idle if entry[2] > now]
+            expired.extend(handle for handle, _, expires_at in idle if expires_at <= now)
+            if kept:
+                self._idle[key] = kept
+            else:
+                del self._idle[key]
+        self.stats.evictions += len(expired)
+        return expired
+
+    @staticmethod
+    def _is_valid(handle: Any) -> bool:
+        # a heartbeat on the session, which doesn't need a warehouse. Connectors without
+        # is_valid() only know if the connection was closed, not if the session expired or
+        # was killed, so they are sent a query instead
+        is_valid = getattr(handle, "is_valid", None)
+        if is_valid is not None:
+            return is_valid()
+        if handle.is_closed():
+            return False
+        try:
+            cursor = handle.cursor()
+            try:
+                cursor.execute("select 1")
+            finally:
+                cursor.close()
+        except Exception as e:
+            logger.debug(f"Snowflake session failed its heartbeat: {e}")
+            return False
+        return True
+
+    @staticmethod
+    def _close(handles: List[Any]) -> None:
+        for handle in handles:
+            try:
+                handle.close()
+            except Exception as e:
+                logger.debug(f"Error closing an idle Snowflake session: {e}")
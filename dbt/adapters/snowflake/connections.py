@@ -1,11 +1,15 @@
+import atexit
 import base64
 import datetime
 import os
 import sys
+import threading
 
-if sys.version_info < (3, 9):
-    from functools import lru_cache
+import functools
+import itertools
+from functools import lru_cache
 
+if sys.version_info < (3, 9):
     cache = lru_cache(maxsize=None)
 else:
     from functools import cache
@@ -13,14 +17,30 @@ else:
 import pytz
 import re
 from contextlib import contextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from io import StringIO
-from time import sleep
-
-from typing import Optional, Tuple, Union, Any, List, Iterable, TYPE_CHECKING
+from time import monotonic, perf_counter, sleep
+from weakref import WeakKeyDictionary
+
+from typing import (
+    Callable,
+    FrozenSet,
+    Optional,
+    Tuple,
+    Union,
+    Any,
+    Dict,
+    List,
+    Iterable,
+    Iterator,
+    NamedTuple,
+    Sequence,
+    Set,
+    Type,
+    TYPE_CHECKING,
+    cast,
+)
 
-from cryptography.hazmat.primitives import serialization
-from cryptography.hazmat.primitives.asymmetric.rsa import RSAPrivateKey
 import requests
 import snowflake.connector
 import snowflake.connector.constants
@@ -30,6 +50,8 @@ from snowflake.connector.errors import (
     DatabaseError,
     InternalError,
     InternalServerError,
+    NotSupportedError,
+    ProgrammingError,
     ServiceUnavailableError,
     GatewayTimeoutError,
     RequestTimeoutError,
@@ -46,15 +68,32 @@ from dbt_common.exceptions import (
 from dbt_common.exceptions import DbtDatabaseError
 from dbt_common.record import get_record_mode_from_env, RecorderMode
 from dbt.adapters.exceptions.connection import FailedToConnectError
-from dbt.adapters.contracts.connection import AdapterResponse, Connection, Credentials
+from dbt.adapters.contracts.connection import (
+    AdapterResponse,
+    Connection,
+    ConnectionState,
+    Credentials,
+    Identifier,
+)
 from dbt.adapters.sql import SQLConnectionManager
 from dbt.adapters.events.logging import AdapterLogger
 from dbt_common.events.functions import warn_or_error
-from dbt.adapters.events.types import AdapterEventWarning, AdapterEventError
+from dbt_common.utils import cast_to_str
+from dbt.adapters.events.types import (
+    AdapterEventWarning,
+    AdapterEventError,
+    ConnectionUsed,
+    SQLQuery,
+    SQLQueryStatus,
+)
+from dbt_common.dataclass_schema import StrEnum
+from dbt_common.events.contextvars import get_node_info
+from dbt_common.events.functions import fire_event
 from dbt_common.ui import line_wrap_message, warning_tag
 from dbt.adapters.snowflake.record import SnowflakeRecordReplayHandle
 
-from dbt.adapters.snowflake.auth import private_key_from_file, private_key_from_string
+from dbt.adapters.snowflake.auth import PRIVATE_KEY_CACHE
+from dbt.adapters.snowflake.connection_pool import SnowflakeConnectionPool
 
 if TYPE_CHECKING:
     import agate
@@ -69,19 +108,293 @@ if os.getenv("DBT_SNOWFLAKE_CONNECTOR_DEBUG_LOGGING"):
 
 _TOKEN_REQUEST_URL = "https://{}.snowflakecomputing.com/oauth/token-request"
 
+# cached access tokens are refreshed this many seconds before they expire
+ACCESS_TOKEN_REFRESH_MARGIN = 60.0
+
+# seconds between status checks of a re-attached query, doubling up to the maximum. The
+# maximum is what a long query can finish before dbt notices, so it is kept short
+QUERY_POLL_MIN_INTERVAL = 0.1
+QUERY_POLL_MAX_INTERVAL = 1.0
+# consecutive transient errors tolerated while checking the status of a re-attached query
+QUERY_POLL_MAX_ERRORS = 5
+
+# errors caused by the network or by Snowflake being briefly unavailable
+TRANSIENT_ERRORS = (
+    InternalServerError,
+    ServiceUnavailableError,
+    GatewayTimeoutError,
+    RequestTimeoutError,
+    BadGatewayError,
+    OtherHTTPRetryableError,
+)
+
+# idle sessions shared by every connection manager in the process, see `pool_connections`
+CONNECTION_POOL = SnowflakeConnectionPool()
+atexit.register(CONNECTION_POOL.close_all)
+
 ERROR_REDACTION_PATTERNS = {
     re.compile(r"Row Values: \[(.|\n)*\]"): "Row Values: [redacted]",
     re.compile(r"Duplicate field key '(.|\n)*'"): "Duplicate field key '[redacted]'",
 }
 
 
+# removes quoted text and comments, whatever is left over decides if a statement is empty
+_WITHOUT_COMMENTS_RE = re.compile(r"(\".*?\"|\'.*?\')|(/\*.*?\*/|--[^\r\n]*$)", re.MULTILINE)
+
+# sql longer than this is split without caching it, large compiled models are rarely re-run
+_SPLIT_CACHE_MAX_SQL_LENGTH = 64 * 1024
+
+
+class StatementKind(StrEnum):
+    Begin = "begin"
+    Commit = "commit"
+    Query = "query"
+
+
+class SessionSetting(StrEnum):
+    Warehouse = "warehouse"
+    Role = "role"
+    Database = "database"
+    Schema = "schema"
+    QueryTag = "query_tag"
+
+
+class SnowflakeStatement(NamedTuple):
+    sql: str
+    kind: StatementKind
+    is_put_or_get: bool
+    # the session settings the statement changes and their new values, None if unknown
+    session_changes: Tuple[Tuple[SessionSetting, Optional[str]], ...] = ()
+    # the identifiers of the relations whose columns the statement may change, None if it
+    # may change any relation
+    altered_relations: Optional[FrozenSet[str]] = frozenset()
+
+
+_USE_KEYWORD_RE = re.compile(r"use\b", re.IGNORECASE)
+_ALTER_SESSION_RE = re.compile(r"alter\s+session\b", re.IGNORECASE)
+_USE_RE = re.compile(
+    r'use\s+(warehouse|role|database|schema)\s+("(?:[^"]|"")+"|[^\s;"]+)\s*;?', re.IGNORECASE
+)
+_QUERY_TAG_RE = re.compile(
+    r"alter\s+session\s+(?:set\s+query_tag\s*=\s*'((?:[^'\\]|\\.|'')*)'|unset\s+query_tag)\s*;?",
+    re.IGNORECASE | re.DOTALL,
+)
+
+
+def _normalize_name(name: str) -> str:
+    """Return an identifier the way Snowflake stores it."""
+    if name.startswith('"'):
+        return name[1:-1].replace('""', '"')
+    return name.upper()
+
+
+def _session_changes(sql: str) -> Tuple[Tuple[SessionSetting, Optional[str]], ...]:
+    text = sql.strip()
+    if text.startswith(("--", "/*")):
+        text = _WITHOUT_COMMENTS_RE.sub(lambda m: m.group(1) or "", text).strip()
+    if _USE_KEYWORD_RE.match(text):
+        match = _USE_RE.fullmatch(text)
+        if match is None:
+            # e.g. `use my_database` or `use schema "my_database"."my_schema"`
+            return ((SessionSetting.Database, None), (SessionSetting.Schema, None))
+        setting, name = SessionSetting(match.group(1).lower()), match.group(2)
+        if setting == SessionSetting.Schema and not name.startswith('"') and "." in name:
+            database, name = name.split(".", 1)
+            return (
+                (SessionSetting.Database, _normalize_name(database)),
+                (SessionSetting.Schema, _normalize_name(name)),
+            )
+        if setting == SessionSetting.Database:
+            # the session switches to the database's PUBLIC schema, if there is one
+            return ((setting, _normalize_name(name)), (SessionSetting.Schema, None))
+        return ((setting, _normalize_name(name)),)
+
+    if _ALTER_SESSION_RE.match(text) and "query_tag" in text.lower():
+        match = _QUERY_TAG_RE.fullmatch(text)
+        if match is None:
+            return ((SessionSetting.QueryTag, None),)
+        tag = re.sub(r"\\(.)", r"\1", (match.group(1) or "").replace("''", "'"))
+        return ((SessionSetting.QueryTag, tag),)
+
+    return ()
+
+
+_NAME = r'(?:"(?:[^"]|"")+"|[^\s."(;]+)'
+_QUALIFIED_NAME = rf"{_NAME}(?:\s*\.\s*{_NAME})*"
+_DDL_KEYWORD_RE = re.compile(r"(?:create|alter|drop|undrop)\b", re.IGNORECASE)
+_RELATION_DDL_RE = re.compile(
+    r"(?:create(?:\s+or\s+replace)?|alter|drop|undrop)\s+"
+    r"(?:(?:local|global|temp|temporary|volatile|transient|secure|recursive|dynamic|iceberg"
+    r"|external|materialized|hybrid|event)\s+)*"
+    r"(?:table|view)\s+(?:if\s+(?:not\s+)?exists\s+)?"
+    rf"({_QUALIFIED_NAME})",
+    re.IGNORECASE,
+)
+_CONTAINER_DDL_RE = re.compile(
+    r"(?:create(?:\s+or\s+replace)?|alter|drop|undrop)\s+(?:transient\s+)?(?:schema|database)\b",
+    re.IGNORECASE,
+)
+_RENAMED_TO_RE = re.compile(rf"\b(?:rename\s+to|swap\s+with)\s+({_QUALIFIED_NAME})", re.IGNORECASE)
+_TRANSACTION_BEGIN_RE = re.compile(
+    r"(?:begin|start)(?:\s+(?:transaction|work))?(?:\s+name\s+\S+)?\s*;?", re.IGNORECASE
+)
+# statements that run other statements dbt doesn't see, e.g. the stored procedures of python
+# models, which create their relation from python
+_OPAQUE_STATEMENT_RE = re.compile(
+    r"(?:call|execute|declare|begin)\b|with\b.*\bas\s+procedure\b", re.IGNORECASE | re.DOTALL
+)
+
+
+def _identifier(qualified_name: str) -> str:
+    """Return the last part of a possibly qualified name, the way Snowflake stores it."""
+    parts = re.findall(_NAME, qualified_name)
+    return _normalize_name(parts[-1])
+
+
+def _altered_relations(sql: str) -> Optional[FrozenSet[str]]:
+    text = sql.strip()
+    if text.startswith(("--", "/*")):
+        text = _WITHOUT_COMMENTS_RE.sub(lambda m: m.group(1) or "", text).strip()
+    if _DDL_KEYWORD_RE.match(text):
+        if _CONTAINER_DDL_RE.match(text):
+            return None
+        match = _RELATION_DDL_RE.match(text)
+        if match is None:
+            # stages, functions, warehouses and the like don't have columns
+            return frozenset()
+        called = text[match.end(1) :].lstrip().startswith("(")
+        if called and _identifier(match.group(1)) in ("IDENTIFIER", "TABLE"):
+            # the name is only known when the statement runs, e.g. identifier($name)
+            return None
+        names = [match.group(1)] + [m.group(1) for m in _RENAMED_TO_RE.finditer(text)]
+        return frozenset(_identifier(name) for name in names)
+    if _OPAQUE_STATEMENT_RE.match(text) and not _TRANSACTION_BEGIN_RE.fullmatch(text):
+        return None
+    return frozenset()
+
+
+def _session_change_sql(setting: SessionSetting, value: str) -> str:
+    """Return the statement that changes a session setting. Quotes are never applied to
+    names."""
+    if setting != SessionSetting.QueryTag:
+        return f"use {setting} {value}"
+    if not value:
+        return "alter session unset query_tag"
+    return "alter session set query_tag = '{}'".format(value.replace("'", "''"))
+
+
+@dataclass
+class SnowflakeSessionState:
+    """The session settings of an open connection, as far as dbt knows them. None means the
+    value is unknown, so changing it is never skipped."""
+
+    warehouse: Optional[str] = None
+    role: Optional[str] = None
+    database: Optional[str] = None
+    schema: Optional[str] = None
+    query_tag: Optional[str] = None
+    # deferred changes, made right before the next statement runs on the connection
+    pending: Dict[SessionSetting, str] = field(default_factory=dict)
+    # the settings statements changed, or may have changed, since the session was opened
+    changed: Set[SessionSetting] = field(default_factory=set)
+
+    def get(self, setting: SessionSetting) -> Optional[str]:
+        """Return the value the setting has, or will have once deferred changes are made."""
+        if setting in self.pending:
+            return self.pending[setting]
+        return getattr(self, setting)
+
+
+def _split_statements(sql: str) -> Tuple[SnowflakeStatement, ...]:
+    """Split sql at semicolons, dropping statements that only contain comments, and classify
+    what's left so the caller doesn't need to inspect the statements again."""
+    statements = []
+    for query, is_put_or_get in snowflake.connector.util_text.split_statements(StringIO(sql)):
+        if _WITHOUT_COMMENTS_RE.sub("", query).strip() == "":
+            continue
+        lowered = query.lower()
+        if lowered == "begin;":
+            kind = StatementKind.Begin
+        elif lowered == "commit;":
+            kind = StatementKind.Commit
+        else:
+            kind = StatementKind.Query
+        statements.append(
+            SnowflakeStatement(
+                query,
+                kind,
+                bool(is_put_or_get),
+                _session_changes(query),
+                _altered_relations(query),
+            )
+        )
+    return tuple(statements)
+
+
+_cached_split_statements = lru_cache(maxsize=256)(_split_statements)
+
+
+def split_statements(sql: str) -> Tuple[SnowflakeStatement, ...]:
+    if len(sql) > _SPLIT_CACHE_MAX_SQL_LENGTH:
+        return _split_statements(sql)
+    return _cached_split_statements(sql)
+
+
+# the only column types the connector returns as timezone aware datetimes
+_TIMEZONE_AWARE_TYPE_CODES = frozenset(
+    snowflake.connector.constants.FIELD_NAME_TO_ID[type_name]
+    for type_name in ("TIMESTAMP_LTZ", "TIMESTAMP_TZ")
+)
+# column types Arrow batches convert differently from rows, see _arrow_matches_rows()
+_FIXED_TYPE_CODE = snowflake.connector.constants.FIELD_NAME_TO_ID["FIXED"]
+_TIMESTAMP_TZ_TYPE_CODE = snowflake.connector.constants.FIELD_NAME_TO_ID["TIMESTAMP_TZ"]
+
+
 @cache
-def snowflake_private_key(private_key: RSAPrivateKey) -> bytes:
-    return private_key.private_bytes(
-        encoding=serialization.Encoding.DER,
-        format=serialization.PrivateFormat.PKCS8,
-        encryption_algorithm=serialization.NoEncryption(),
-    )
+def _fixed_offset(offset_minutes: int) -> datetime.tzinfo:
+    return pytz.FixedOffset(offset_minutes)
+
+
+class _AccessTokenCache:
+    """OAuth access tokens shared by every connection in the process, so a token is only
+    requested again shortly before it expires. Each key is refreshed by one thread at a time,
+    the others wait for its token instead of requesting their own."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        # the token of each key and when it should be refreshed, on the monotonic clock
+        self._tokens: Dict[Tuple[str, ...], Tuple[str, float]] = {}
+        self._refresh_locks: Dict[Tuple[str, ...], threading.Lock] = {}
+
+    def get(self, key: Tuple[str, ...], request: Callable[[], Tuple[str, Optional[int]]]) -> str:
+        """Return the cached token for the key, or request one, which returns the token and
+        the seconds it expires in."""
+        token = self._valid_token(key)
+        if token is not None:
+            return token
+        with self._lock:
+            refresh_lock = self._refresh_locks.setdefault(key, threading.Lock())
+        with refresh_lock:
+            # another thread may have refreshed the token while this one waited
+            token = self._valid_token(key)
+            if token is not None:
+                return token
+            token, expires_in = request()
+            if expires_in is not None:
+                with self._lock:
+                    refresh_at = monotonic() + expires_in - ACCESS_TOKEN_REFRESH_MARGIN
+                    self._tokens[key] = (token, refresh_at)
+            return token
+
+    def _valid_token(self, key: Tuple[str, ...]) -> Optional[str]:
+        with self._lock:
+            cached = self._tokens.get(key)
+        if cached is not None and monotonic() < cached[1]:
+            return cached[0]
+        return None
+
+
+_access_tokens = _AccessTokenCache()
 
 
 @dataclass
@@ -89,6 +402,30 @@ class SnowflakeAdapterResponse(AdapterResponse):
     query_id: str = ""
 
 
+@dataclass(frozen=True)
+class SnowflakeConnectArgs:
+    """The arguments of `snowflake.connector.connect` for a profile, computed once by
+    `SnowflakeCredentials.connect_args`. Only the OAuth access token and the private key are
+    looked up again on each open, they can change while dbt runs and both are cached."""
+
+    # everything but the session parameters, the access token and the private key
+    kwargs: Tuple[Tuple[str, Any], ...]
+    session_parameters: Tuple[Tuple[str, Any], ...]
+    retryable_exceptions: Tuple[Type[Exception], ...]
+    record_mode: Optional[RecorderMode]
+    # the token is an OAuth refresh token, exchanged for an access token on each open
+    refreshes_token: bool
+
+    def connect_kwargs(self, credentials: "SnowflakeCredentials") -> Dict[str, Any]:
+        kwargs = dict(self.kwargs)
+        # a new dict for every session, the connector may update it
+        kwargs["session_parameters"] = dict(self.session_parameters)
+        if self.refreshes_token:
+            kwargs["token"] = credentials._get_access_token()
+        kwargs["private_key"] = credentials._get_private_key()
+        return kwargs
+
+
 @dataclass
 class SnowflakeCredentials(Credentials):
     account: str
@@ -117,6 +454,22 @@ class SnowflakeCredentials(Credentials):
     insecure_mode: Optional[bool] = False
     # this needs to default to `None` so that we can tell if the user set it; see `__post_init__()`
     reuse_connections: Optional[bool] = None
+    arrow_result_fetching: bool = False
+    multi_statement_execution: bool = False
+    # most metadata queries (e.g. listing relations) in flight at once, `threads` if not set
+    max_metadata_queries: Optional[int] = None
+    list_relations_per_database: bool = False
+    # a file to keep listed relations in between invocations, see `list_relations_in_schemas()`
+    relation_cache_path: Optional[str] = None
+    # a directory to keep the catalog in between invocations, see `_get_one_catalog()`
+    catalog_cache_path: Optional[str] = None
+    # share sessions between threads through CONNECTION_POOL instead of one per thread
+    pool_connections: bool = False
+    # seconds a pooled session can stay idle before it is closed
+    pool_idle_timeout: int = 600
+    # sessions opened into the pool when a command that runs queries starts, with
+    # `pool_connections`, see `SnowflakeAdapter.acquire_connection()`
+    prewarm_connections: int = 0
 
     def __post_init__(self):
         if self.authenticator != "oauth" and (self.oauth_client_secret or self.oauth_client_id):
@@ -184,12 +537,90 @@ class SnowflakeCredentials(Credentials):
             "retry_all",
             "insecure_mode",
             "reuse_connections",
+            "arrow_result_fetching",
+            "multi_statement_execution",
+            "max_metadata_queries",
+            "list_relations_per_database",
+            "relation_cache_path",
+            "catalog_cache_path",
+            "pool_connections",
+            "pool_idle_timeout",
+            "prewarm_connections",
+        )
+
+    def pool_key(self) -> Tuple[Any, ...]:
+        """The sessions these credentials open can be shared by credentials with the same key,
+        they log in as the same user and start in the same state."""
+        return (
+            self.account,
+            self.user,
+            self.role,
+            self.warehouse,
+            self.database,
+            self.schema,
+            self.authenticator,
+            self.host,
+            self.port,
+            self.query_tag,
+        )
+
+    @functools.cached_property
+    def connect_args(self) -> SnowflakeConnectArgs:
+        """The arguments sessions are opened with, computed the first time they are used."""
+        kwargs = dict(
+            account=self.account,
+            database=self.database,
+            schema=self.schema,
+            warehouse=self.warehouse,
+            role=self.role,
+            autocommit=True,
+            client_session_keep_alive=self.client_session_keep_alive,
+            application="dbt",
+            insecure_mode=self.insecure_mode,
+            **self._static_auth_args(),
+        )
+        if self.arrow_result_fetching:
+            # scaled numbers in Arrow batches are decimals, like they are in rows
+            kwargs["arrow_number_to_decimal"] = True
+
+        retryable_exceptions: List[Type[Exception]] = [
+            InternalError,
+            *TRANSIENT_ERRORS,
+            BindUploadError,
+        ]
+        # these two options are for backwards compatibility
+        if self.retry_all:
+            retryable_exceptions = [Error]
+        elif self.retry_on_database_errors:
+            retryable_exceptions.insert(0, DatabaseError)
+
+        return SnowflakeConnectArgs(
+            kwargs=tuple(kwargs.items()),
+            session_parameters=(("QUERY_TAG", self.query_tag),) if self.query_tag else (),
+            retryable_exceptions=tuple(retryable_exceptions),
+            record_mode=get_record_mode_from_env(),
+            refreshes_token=self._refreshes_token(),
         )
 
     def auth_args(self):
+        result = self._static_auth_args()
+        if self._refreshes_token():
+            result["token"] = self._get_access_token()
+        result["private_key"] = self._get_private_key()
+        return result
+
+    def _refreshes_token(self) -> bool:
+        # with a client ID/client secret, the token is a refresh token, not an access token
+        return bool(
+            self.authenticator == "oauth" and self.oauth_client_id and self.oauth_client_secret
+        )
+
+    def _static_auth_args(self) -> Dict[str, Any]:
+        """The authentication args that stay the same while dbt runs, that is all of them but
+        an access token for a refresh token and the private key."""
         # Pull all of the optional authentication args for the connector,
         # let connector handle the actual arg validation
-        result = {}
+        result: Dict[str, Any] = {}
         if self.user:
             result["user"] = self.user
         if self.password:
@@ -207,25 +638,23 @@ class SnowflakeCredentials(Credentials):
         if self.authenticator:
             result["authenticator"] = self.authenticator
             if self.authenticator == "oauth":
-                token = self.token
-                # if we have a client ID/client secret, the token is a refresh
-                # token, not an access token
-                if self.oauth_client_id and self.oauth_client_secret:
-                    token = self._get_access_token()
-                elif self.oauth_client_id:
+                if self.oauth_client_id and not self.oauth_client_secret:
                     warn_or_error(
                         AdapterEventWarning(
                             base_msg="Invalid profile: got an oauth_client_id, but not an oauth_client_secret!"
                         )
                     )
-                elif self.oauth_client_secret:
+                elif self.oauth_client_secret and not self.oauth_client_id:
                     warn_or_error(
                         AdapterEventWarning(
                             base_msg="Invalid profile: got an oauth_client_secret, but not an oauth_client_id!"
                         )
                     )
 
-                result["token"] = token
+                # with a client ID/client secret, the token is a refresh token, which
+                # auth_args() exchanges for an access token
+                if not self._refreshes_token():
+                    result["token"] = self.token
 
             elif self.authenticator == "jwt":
                 # If authenticator is 'jwt', then the 'token' value should be used
@@ -239,7 +668,6 @@ class SnowflakeCredentials(Credentials):
             # enable mfa token cache for linux
             result["client_request_mfa_token"] = True
         result["reuse_connections"] = self.reuse_connections
-        result["private_key"] = self._get_private_key()
         return result
 
     def _get_access_token(self) -> str:
@@ -253,6 +681,12 @@ class SnowflakeCredentials(Credentials):
                 "need a client ID a client secret, and a refresh token to get " "an access token"
             )
 
+        key = (self.account, self.oauth_client_id, self.token)
+        return _access_tokens.get(key, self._request_access_token)  # type: ignore[arg-type]
+
+    def _request_access_token(self) -> Tuple[str, Optional[int]]:
+        """Exchange the refresh token for an access token, returning it with the seconds it
+        expires in, if the response says."""
         # should the full url be a config item?
         token_url = _TOKEN_REQUEST_URL.format(self.account)
         # I think this is only used to redirect on success, which we ignore
@@ -298,24 +732,35 @@ class SnowflakeCredentials(Credentials):
                 "This error occurs when authentication has expired. "
                 "Please reauth with your auth provider."
             )
-        return result_json["access_token"]
+        expires_in = result_json.get("expires_in")
+        return result_json["access_token"], int(expires_in) if expires_in is not None else None
 
     def _get_private_key(self) -> Optional[bytes]:
         """Get Snowflake private key by path, from a Base64 encoded DER bytestring or None."""
         if self.private_key and self.private_key_path:
             raise DbtConfigError("Cannot specify both `private_key`  and `private_key_path`")
         elif self.private_key:
-            private_key = private_key_from_string(self.private_key, self.private_key_passphrase)
+            return PRIVATE_KEY_CACHE.from_string(self.private_key, self.private_key_passphrase)
         elif self.private_key_path:
-            private_key = private_key_from_file(self.private_key_path, self.private_key_passphrase)
-        else:
-            return None
-        return snowflake_private_key(private_key)
+            return PRIVATE_KEY_CACHE.from_file(self.private_key_path, self.private_key_passphrase)
+        return None
+
+
+# keyed by handle, so the state goes away with the session it describes. Shared by every
+# connection manager, since pooled sessions move between them
+_session_states: "WeakKeyDictionary[Any, SnowflakeSessionState]" = WeakKeyDictionary()
+_session_states_lock = threading.Lock()
 
 
 class SnowflakeConnectionManager(SQLConnectionManager):
     TYPE = "snowflake"
 
+    def __init__(self, profile, mp_context) -> None:
+        super().__init__(profile, mp_context)
+        # called with the identifiers of the relations statements may have changed, or None
+        # when any relation may have changed
+        self.altered_relations_callbacks: List[Callable[[Optional[FrozenSet[str]]], None]] = []
+
     @contextmanager
     def exception_handler(self, sql):
         try:
@@ -367,34 +812,34 @@ class SnowflakeConnectionManager(SQLConnectionManager):
             return connection
 
         creds = connection.credentials
-        timeout = creds.connect_timeout
+        if not cls._pools_connections(creds):
+            return cls._connect(connection)
 
-        def connect():
-            session_parameters = {}
+        handle = CONNECTION_POOL.checkout(creds.pool_key())
+        if handle is not None:
+            connection.handle = handle
+            connection.state = ConnectionState.OPEN
+            return connection
+        start = perf_counter()
+        connection = cls._connect(connection)
+        CONNECTION_POOL.record_open(perf_counter() - start)
+        return connection
 
-            if creds.query_tag:
-                session_parameters.update({"QUERY_TAG": creds.query_tag})
-            handle = None
+    @classmethod
+    def _connect(cls, connection):
+        """Open a new session for the connection."""
+        creds = connection.credentials
+        timeout = creds.connect_timeout
+        connect_args = creds.connect_args
 
+        def connect():
             # In replay mode, we won't connect to a real database at all, while
             # in record and diff modes we do, but insert an intermediate handle
             # object which monitors native connection activity.
-            rec_mode = get_record_mode_from_env()
+            rec_mode = connect_args.record_mode
             handle = None
             if rec_mode != RecorderMode.REPLAY:
-                handle = snowflake.connector.connect(
-                    account=creds.account,
-                    database=creds.database,
-                    schema=creds.schema,
-                    warehouse=creds.warehouse,
-                    role=creds.role,
-                    autocommit=True,
-                    client_session_keep_alive=creds.client_session_keep_alive,
-                    application="dbt",
-                    insecure_mode=creds.insecure_mode,
-                    session_parameters=session_parameters,
-                    **creds.auth_args(),
-                )
+                handle = snowflake.connector.connect(**connect_args.connect_kwargs(creds))
 
             if rec_mode is not None:
                 # If using the record/replay mechanism, regardless of mode, we
@@ -406,31 +851,88 @@ class SnowflakeConnectionManager(SQLConnectionManager):
         def exponential_backoff(attempt: int):
             return attempt * attempt
 
-        retryable_exceptions = [
-            InternalError,
-            InternalServerError,
-            ServiceUnavailableError,
-            GatewayTimeoutError,
-            RequestTimeoutError,
-            BadGatewayError,
-            OtherHTTPRetryableError,
-            BindUploadError,
-        ]
-        # these two options are for backwards compatibility
-        if creds.retry_all:
-            retryable_exceptions = [Error]
-        elif creds.retry_on_database_errors:
-            retryable_exceptions.insert(0, DatabaseError)
-
         return cls.retry_connection(
             connection,
             connect=connect,
             logger=logger,
             retry_limit=creds.connect_retries,
             retry_timeout=timeout if timeout is not None else exponential_backoff,
-            retryable_exceptions=retryable_exceptions,
+            retryable_exceptions=connect_args.retryable_exceptions,
         )
 
+    def prewarm(self) -> None:
+        """Open `prewarm_connections` sessions into the pool in the background. Logging in
+        takes a while, so the first models shouldn't have to wait for it."""
+        credentials = cast(SnowflakeCredentials, self.profile.credentials)
+        if self._pools_connections(credentials) and credentials.prewarm_connections:
+            CONNECTION_POOL.prewarm(
+                credentials.pool_key(),
+                functools.partial(self._prewarmed_handle, credentials),
+                credentials.prewarm_connections,
+                credentials.pool_idle_timeout,
+            )
+
+    @classmethod
+    def _prewarmed_handle(cls, credentials: SnowflakeCredentials) -> Any:
+        connection = Connection(
+            type=Identifier(cls.TYPE),
+            name="prewarm",
+            state=ConnectionState.INIT,
+            transaction_open=False,
+            handle=None,
+            credentials=credentials,
+        )
+        return cls._connect(connection).handle
+
+    @staticmethod
+    def _pools_connections(credentials) -> bool:
+        # recorded and replayed sessions are tied to the connection that opened them
+        return credentials.pool_connections and credentials.connect_args.record_mode is None
+
+    def _check_in(self, connection: Connection) -> None:
+        """Return the session of an open connection to the pool and mark the connection closed,
+        the next `open()` checks a session out again."""
+        with _session_states_lock:
+            state = _session_states.get(connection.handle)
+        if connection.transaction_open or (
+            state is not None and not self._in_opened_state(connection.credentials, state)
+        ):
+            # the session isn't in the state its credentials open it in
+            self.close(connection)
+            return
+        CONNECTION_POOL.checkin(
+            connection.credentials.pool_key(),
+            connection.handle,
+            connection.credentials.pool_idle_timeout,
+        )
+        connection.handle = None
+        connection.state = ConnectionState.CLOSED
+
+    @staticmethod
+    def _in_opened_state(credentials, state: SnowflakeSessionState) -> bool:
+        """Whether the session is, or will be once its deferred changes are made, in the state
+        the credentials open sessions in. Deferred changes stay with the session in the pool,
+        the next connection that checks it out makes them before its first statement, or
+        drops them when it changes the setting to the value the session already has."""
+        for setting in SessionSetting:
+            if setting == SessionSetting.QueryTag:
+                value = state.get(setting)
+                opened: Optional[str] = credentials.query_tag or ""
+            else:
+                # deferred changes hold names as written, tracked settings as stored
+                value = state.pending.get(setting)
+                value = getattr(state, setting) if value is None else _normalize_name(value)
+                opened = getattr(credentials, setting)
+                opened = opened if opened is None else _normalize_name(opened)
+            if value is None or opened is None:
+                # settings the credentials leave to Snowflake, or that dbt doesn't know, can
+                # only be assumed to be unchanged if no statement changed them
+                if setting in state.changed or setting in state.pending:
+                    return False
+            elif value != opened:
+                return False
+        return True
+
     def cancel(self, connection):
         handle = connection.handle
         sid = handle.session_id
@@ -477,28 +979,43 @@ class SnowflakeConnectionManager(SQLConnectionManager):
     def clear_transaction(self):
         pass
 
-    @classmethod
-    def _split_queries(cls, sql):
-        "Splits sql statements at semicolons into discrete queries"
-
-        sql_s = str(sql)
-        sql_buf = StringIO(sql_s)
-        split_query = snowflake.connector.util_text.split_statements(sql_buf)
-        return [part[0] for part in split_query]
+    @staticmethod
+    def _timezone_aware_columns(description: Sequence[Sequence]) -> Optional[List[int]]:
+        """Return the indexes of the columns that can contain timezone aware datetimes, or
+        None if the column types are unknown and every column needs to be checked."""
+        if any(len(col) < 2 for col in description):
+            return None
+        return [i for i, col in enumerate(description) if col[1] in _TIMEZONE_AWARE_TYPE_CODES]
 
     @staticmethod
-    def _fix_rows(rows: Iterable[Iterable]) -> Iterable[Iterable]:
+    def _fix_rows(
+        rows: Iterable[Iterable], columns: Optional[Sequence[int]] = None
+    ) -> Iterable[Iterable]:
         # See note in process_results().
+        if columns is not None and not columns:
+            yield from rows
+            return
+
+        # timezones with a fixed offset always map to the same FixedOffset, so they're only
+        # resolved once; others (e.g. with DST) need the offset of each value
+        fixed_timezones: Dict[datetime.tzinfo, datetime.tzinfo] = {}
         for row in rows:
-            fixed_row = []
-            for col in row:
-                if isinstance(col, datetime.datetime) and col.tzinfo:
-                    offset = col.utcoffset()
-                    assert offset is not None
-                    offset_seconds = offset.total_seconds()
-                    new_timezone = pytz.FixedOffset(int(offset_seconds // 60))
-                    col = col.astimezone(tz=new_timezone)
-                fixed_row.append(col)
+            fixed_row = list(row)
+            for i in range(len(fixed_row)) if columns is None else columns:
+                col = fixed_row[i]
+                if not isinstance(col, datetime.datetime) or not col.tzinfo:
+                    continue
+                new_timezone = fixed_timezones.get(col.tzinfo)
+                if new_timezone is not None:
+                    # the offset is the same, so only the tzinfo needs to be swapped
+                    fixed_row[i] = col.replace(tzinfo=new_timezone)
+                    continue
+                offset = col.utcoffset()
+                assert offset is not None
+                new_timezone = _fixed_offset(int(offset.total_seconds() // 60))
+                if col.tzinfo.utcoffset(None) == new_timezone.utcoffset(None):
+                    fixed_timezones[col.tzinfo] = new_timezone
+                fixed_row[i] = col.astimezone(tz=new_timezone)
 
             yield fixed_row
 
@@ -509,6 +1026,99 @@ class SnowflakeConnectionManager(SQLConnectionManager):
         # to replace them with sane timezones.
         return super().process_results(column_names, cls._fix_rows(rows))
 
+    @classmethod
+    def get_result_from_cursor(cls, cursor: Any, limit: Optional[int]) -> "agate.Table":
+        # Override for Snowflake. Look up which columns hold timestamps with a timezone once,
+        # so _fix_rows() can skip every other column.
+        from dbt_common.clients.agate_helper import table_from_data_flat
+
+        data: Iterable[Any] = []
+        column_names: List[str] = []
+
+        if cursor.description is not None:
+            column_names = [col[0] for col in cursor.description]
+            if limit:
+                rows = cursor.fetchmany(limit)
+            else:
+                rows = cursor.fetchall()
+            columns = cls._timezone_aware_columns(cursor.description)
+            data = super().process_results(column_names, cls._fix_rows(rows, columns))
+
+        return table_from_data_flat(data, column_names)
+
+    @staticmethod
+    def _arrow_matches_rows(cursor: Any) -> bool:
+        """Whether the Arrow batches of the result convert to the same values as its rows."""
+        if any(len(col) < 2 for col in cursor.description):
+            return False
+        decimals = getattr(getattr(cursor, "connection", None), "arrow_number_to_decimal", False)
+        for col in cursor.description:
+            if col[1] == _TIMESTAMP_TZ_TYPE_CODE:
+                # Arrow converts the values to UTC, dropping the offset of each row
+                return False
+            if col[1] == _FIXED_TYPE_CODE and len(col) > 5 and col[5] and decimals is not True:
+                # Arrow converts scaled numbers to floats unless the connection says otherwise
+                return False
+        return True
+
+    @staticmethod
+    def _arrow_column_to_pylist(column: Any) -> List[Any]:
+        import pyarrow
+
+        # python datetimes and times hold microseconds, like the connector, drop the digits
+        # beyond them. Without pandas installed, Arrow refuses to do it in to_pylist()
+        if pyarrow.types.is_timestamp(column.type) and column.type.unit == "ns":
+            column = column.cast(pyarrow.timestamp("us", tz=column.type.tz), safe=False)
+        elif pyarrow.types.is_time64(column.type) and column.type.unit == "ns":
+            column = column.cast(pyarrow.time64("us"), safe=False)
+        return column.to_pylist()
+
+    @classmethod
+    def _rows_from_arrow_batches(
+        cls, batches: Iterable[Any], limit: Optional[int]
+    ) -> Iterator[Tuple]:
+        # Columns are converted to python objects one at a time, which lets Arrow resolve the
+        # timezone of each TIMESTAMP_LTZ column once instead of once per cell. Arrow produces
+        # standard library tzinfo objects, so no _fix_rows() pass is needed.
+        remaining = limit or None
+        for batch in batches:
+            if remaining is not None:
+                batch = batch.slice(0, remaining)
+                remaining -= batch.num_rows
+            yield from zip(*(cls._arrow_column_to_pylist(column) for column in batch.columns))
+            if remaining == 0:
+                return
+
+    @classmethod
+    def get_arrow_result_from_cursor(cls, cursor: Any, limit: Optional[int]) -> "agate.Table":
+        """Build the result table from Arrow batches instead of python rows.
+
+        Falls back to `get_result_from_cursor` when the result set is not available in Arrow
+        format, e.g. for `show` commands, when pyarrow is not installed, or in record/replay mode,
+        and when Arrow would convert some of its columns to different values than rows have.
+        """
+        from dbt_common.clients.agate_helper import table_from_data_flat
+
+        fetch_arrow_batches = getattr(cursor, "fetch_arrow_batches", None)
+        if (
+            cursor.description is None
+            or fetch_arrow_batches is None
+            or not cls._arrow_matches_rows(cursor)
+        ):
+            return cls.get_result_from_cursor(cursor, limit)
+
+        try:
+            batches = fetch_arrow_batches()
+        except (NotSupportedError, ProgrammingError):
+            logger.debug("Result set is not available in Arrow format, fetching rows instead.")
+            return cls.get_result_from_cursor(cursor, limit)
+
+        column_names = [col[0] for col in cursor.description]
+        rows = cls._rows_from_arrow_batches(batches, limit)
+        # skip our process_results(), the Arrow rows don't need fixing
+        data = super().process_results(column_names, rows)
+        return table_from_data_flat(data, column_names)
+
     def execute(
         self, sql: str, auto_begin: bool = False, fetch: bool = False, limit: Optional[int] = None
     ) -> Tuple[AdapterResponse, "agate.Table"]:
@@ -518,16 +1128,79 @@ class SnowflakeConnectionManager(SQLConnectionManager):
 
         _, cursor = self.add_query(sql, auto_begin)
         response = self.get_response(cursor)
-        if fetch:
+        credentials = cast(SnowflakeCredentials, self.profile.credentials)
+        if fetch and credentials.arrow_result_fetching:
+            table = self.get_arrow_result_from_cursor(cursor, limit)
+        elif fetch:
             table = self.get_result_from_cursor(cursor, limit)
         else:
             table = empty_table()
         return response, table
 
-    def add_standard_query(self, sql: str, **kwargs) -> Tuple[Connection, Any]:
+    def add_standard_query(
+        self,
+        sql: str,
+        auto_begin: bool = True,
+        bindings: Optional[Any] = None,
+        abridge_sql_log: bool = False,
+    ) -> Tuple[Connection, Any]:
         # This is the happy path for a single query. Snowflake has a few odd behaviors that
         # require preprocessing within the 'add_query' method below.
-        return super().add_query(self._add_query_comment(sql), **kwargs)
+        connection = self.get_thread_connection()
+        sql = self._add_query_comment(sql)
+
+        self._fire_query_events(connection, sql, abridge_sql_log)
+        with self.exception_handler(sql):
+            pre = perf_counter()
+            cursor = connection.handle.cursor()
+            try:
+                cursor.execute(sql, bindings)
+            except TRANSIENT_ERRORS as e:
+                sfqid = self._reattachable_query_id(e, cursor)
+                if sfqid is None:
+                    raise
+                logger.debug(f"Lost the connection while running query {sfqid}: {e}")
+                cursor = self._reattach_query(connection, sfqid)
+
+            fire_event(
+                SQLQueryStatus(
+                    status=str(self.get_response(cursor)),
+                    elapsed=perf_counter() - pre,
+                    node_info=get_node_info(),
+                )
+            )
+
+            return connection, cursor
+
+    def _reattachable_query_id(self, error: Error, cursor: Any) -> Optional[str]:
+        # a query id means Snowflake accepted the query before the connection was lost, so it
+        # is still running or has already finished. The connector builds the errors of failed
+        # HTTP requests without one, the cursor keeps the id of the query it submitted
+        credentials = cast(SnowflakeCredentials, self.profile.credentials)
+        if credentials.connect_args.record_mode is not None:
+            return None
+        return error.sfqid or cursor.sfqid or None
+
+    def _reattach_query(self, connection: Connection, sfqid: str) -> Any:
+        """Wait for a query submitted before the connection was lost and load its results,
+        instead of running the query again.
+
+        The connection is reopened first if the old one can't be used, queries keep running
+        in Snowflake after the client disconnects unless ABORT_DETACHED_QUERY is set.
+        """
+        logger.debug(f"Re-attaching to query {sfqid} on connection '{connection.name}'")
+        if connection.handle.is_closed():
+            try:
+                self.close(connection)
+            except Error as e:
+                logger.debug(f"Error closing the lost connection '{connection.name}': {e}")
+                connection.state = ConnectionState.CLOSED
+            self.open(connection)
+
+        self._wait_for_query(connection, sfqid)
+        cursor = connection.handle.cursor()
+        cursor.query_result(sfqid)
+        return cursor
 
     def add_query(
         self,
@@ -541,44 +1214,120 @@ class SnowflakeConnectionManager(SQLConnectionManager):
             # which allows any iterable thing to be passed as a binding.
             bindings = tuple(bindings)
 
-        stripped_queries = self._stripped_queries(sql)
+        self._make_deferred_session_changes()
+        statements = split_statements(str(sql))
 
-        if set(query.lower() for query in stripped_queries).issubset({"begin;", "commit;"}):
-            connection, cursor = self._add_begin_commit_only_queries(
-                stripped_queries,
-                auto_begin=auto_begin,
-                bindings=bindings,
-                abridge_sql_log=abridge_sql_log,
-            )
-        else:
-            connection, cursor = self._add_standard_queries(
-                stripped_queries,
-                auto_begin=auto_begin,
-                bindings=bindings,
-                abridge_sql_log=abridge_sql_log,
-            )
+        try:
+            if all(statement.kind != StatementKind.Query for statement in statements):
+                connection, cursor = self._add_begin_commit_only_queries(
+                    statements,
+                    auto_begin=auto_begin,
+                    bindings=bindings,
+                    abridge_sql_log=abridge_sql_log,
+                )
+            else:
+                connection, cursor = self._add_standard_queries(
+                    statements,
+                    auto_begin=auto_begin,
+                    bindings=bindings,
+                    abridge_sql_log=abridge_sql_log,
+                )
+        except Exception:
+            # some of the statements may have run, so whatever they change is now unknown
+            self._track_session_changes(statements, failed=True)
+            raise
+        finally:
+            self._report_altered_relations(statements)
+        self._track_session_changes(statements)
 
         if cursor is None:
             self._raise_cursor_not_found_error(sql)
 
         return connection, cursor
 
-    def _stripped_queries(self, sql: str) -> List[str]:
-        def strip_query(query):
-            """
-            hack -- after the last ';', remove comments and don't run
-            empty queries. this avoids using exceptions as flow control,
-            and also allows us to return the status of the last cursor
-            """
-            without_comments_re = re.compile(
-                r"(\".*?\"|\'.*?\')|(/\*.*?\*/|--[^\r\n]*$)", re.MULTILINE
-            )
-            return re.sub(without_comments_re, "", query).strip()
+    def get_session_state(self, connection: Optional[Connection] = None) -> SnowflakeSessionState:
+        """Return the tracked settings of a connection's session, the thread connection by
+        default. Tracking starts from what the connector reports for the session."""
+        if connection is None:
+            connection = self.get_thread_connection()
+        handle = connection.handle
+        with _session_states_lock:
+            state = _session_states.get(handle)
+            if state is None:
+                state = SnowflakeSessionState()
+                for setting in (
+                    SessionSetting.Warehouse,
+                    SessionSetting.Role,
+                    SessionSetting.Database,
+                    SessionSetting.Schema,
+                ):
+                    value = getattr(handle, setting, None)
+                    if isinstance(value, str):
+                        setattr(state, setting, value)
+                # the connection is opened with this tag as a session parameter
+                credentials = cast(SnowflakeCredentials, self.profile.credentials)
+                if credentials.query_tag:
+                    state.query_tag = credentials.query_tag
+                _session_states[handle] = state
+        return state
+
+    def change_session(self, setting: SessionSetting, value: str, defer: bool = False) -> None:
+        """Change a setting of the thread connection's session, skipping the statement when
+        the session already has that value.
+
+        A deferred change is made right before the next statement runs on the connection,
+        so it costs nothing if another change makes it redundant first.
+        """
+        state = self.get_session_state()
+        state.pending.pop(setting, None)
+        current = getattr(state, setting)
+        if current is not None:
+            wanted = value if setting == SessionSetting.QueryTag else _normalize_name(value)
+            if current == wanted:
+                return
+        if defer:
+            state.pending[setting] = value
+        else:
+            self.add_query(_session_change_sql(setting, value))
+
+    def _make_deferred_session_changes(self) -> None:
+        connection = self.get_if_exists()
+        if connection is None or connection.handle is None:
+            return
+        state = _session_states.get(connection.handle)
+        if state is None or not state.pending:
+            return
+        pending, state.pending = state.pending, {}
+        for setting, value in pending.items():
+            self.add_query(_session_change_sql(setting, value))
+
+    def _track_session_changes(
+        self, statements: Sequence[SnowflakeStatement], failed: bool = False
+    ) -> None:
+        changes = [change for statement in statements for change in statement.session_changes]
+        if not changes:
+            return
+        state = self.get_session_state()
+        for setting, value in changes:
+            setattr(state, setting, None if failed else value)
+            state.changed.add(setting)
 
-        return [query for query in self._split_queries(sql) if strip_query(query) != ""]
+    def _report_altered_relations(self, statements: Sequence[SnowflakeStatement]) -> None:
+        if not self.altered_relations_callbacks:
+            return
+        altered: Set[str] = set()
+        for statement in statements:
+            if statement.altered_relations is None:
+                for callback in self.altered_relations_callbacks:
+                    callback(None)
+                return
+            altered.update(statement.altered_relations)
+        if altered:
+            for callback in self.altered_relations_callbacks:
+                callback(frozenset(altered))
 
     def _add_begin_commit_only_queries(
-        self, queries: List[str], **kwargs
+        self, statements: Sequence[SnowflakeStatement], **kwargs
     ) -> Tuple[Connection, Any]:
         # if all we get is `begin;` and/or `commit;`
         # raise a warning, then run as standard queries to avoid an error downstream
@@ -590,24 +1339,135 @@ class SnowflakeConnectionManager(SQLConnectionManager):
         )
         logger.warning(line_wrap_message(warning_tag(message)))
 
-        for query in queries:
-            connection, cursor = self.add_standard_query(query, **kwargs)
+        for statement in statements:
+            connection, cursor = self.add_standard_query(statement.sql, **kwargs)
         return connection, cursor
 
-    def _add_standard_queries(self, queries: List[str], **kwargs) -> Tuple[Connection, Any]:
-        for query in queries:
-            # Even though we turn off transactions by default for Snowflake,
-            # the user/macro has passed them *explicitly*, probably to wrap a DML statement
-            # This also has the effect of ignoring "commit" in the RunResult for this model
-            # https://github.com/dbt-labs/dbt-snowflake/issues/147
-            if query.lower() == "begin;":
-                super().add_begin_query()
-            elif query.lower() == "commit;":
-                super().add_commit_query()
+    def _can_batch_statements(
+        self, statements: Sequence[SnowflakeStatement], bindings: Optional[Any]
+    ) -> bool:
+        # bindings can't be split between statements, and the connector can't run PUT/GET or
+        # record/replay cursors as part of a multi-statement request
+        credentials = cast(SnowflakeCredentials, self.profile.credentials)
+        return (
+            credentials.multi_statement_execution
+            and len(statements) > 1
+            and bindings is None
+            and not any(statement.is_put_or_get for statement in statements)
+            and credentials.connect_args.record_mode is None
+        )
+
+    def _fire_query_events(self, connection: Connection, sql: str, abridge_sql_log: bool):
+        # the events SQLConnectionManager.add_query() fires before running a query
+        fire_event(
+            ConnectionUsed(
+                conn_type=self.TYPE,
+                conn_name=cast_to_str(connection.name),
+                node_info=get_node_info(),
+            )
+        )
+        fire_event(
+            SQLQuery(
+                conn_name=cast_to_str(connection.name),
+                sql="{}...".format(sql[:512]) if abridge_sql_log else sql,
+                node_info=get_node_info(),
+            )
+        )
+
+    @staticmethod
+    def _wait_for_query(connection: Connection, sfqid: str) -> None:
+        """Poll the status of a submitted query with backoff until it is no longer running.
+
+        Transient network errors are retried, the query keeps running in Snowflake and can be
+        checked on again by its id. A failed query raises the same error a blocking execute()
+        would.
+        """
+        interval = QUERY_POLL_MIN_INTERVAL
+        errors = 0
+        while True:
+            try:
+                status = connection.handle.get_query_status_throw_if_error(sfqid)
+                errors = 0
+            except TRANSIENT_ERRORS as e:
+                errors += 1
+                if errors > QUERY_POLL_MAX_ERRORS:
+                    raise
+                logger.debug(f"Got a transient error checking the status of query {sfqid}: {e}")
             else:
-                # This adds a query comment to *every* statement
-                # https://github.com/dbt-labs/dbt-snowflake/issues/140
-                connection, cursor = self.add_standard_query(query, **kwargs)
+                if not connection.handle.is_still_running(status):
+                    return
+            sleep(interval)
+            interval = min(interval * 2, QUERY_POLL_MAX_INTERVAL)
+
+    def _add_multi_statement_query(
+        self,
+        statements: Sequence[SnowflakeStatement],
+        auto_begin: bool = True,
+        bindings: Optional[Any] = None,
+        abridge_sql_log: bool = False,
+    ) -> Tuple[Connection, Any]:
+        """Submit all statements in a single request using Snowflake's multi-statement support.
+
+        A status is still reported for every statement, and the returned cursor is positioned
+        on the result of the last statement, the same as running the statements one by one.
+        Only queries are batched, see `_add_standard_queries`.
+        """
+        connection = self.get_thread_connection()
+        sql = "\n".join(self._add_query_comment(statement.sql) for statement in statements)
+
+        self._fire_query_events(connection, sql, abridge_sql_log)
+        with self.exception_handler(sql):
+            pre = perf_counter()
+            cursor = connection.handle.cursor()
+            cursor.execute(sql, num_statements=len(statements))
+            for i in range(len(statements)):
+                if i > 0:
+                    # moving past the last result would reset the cursor, so only advance
+                    # once per remaining statement
+                    cursor.nextset()
+                fire_event(
+                    SQLQueryStatus(
+                        status=str(self.get_response(cursor)),
+                        elapsed=perf_counter() - pre,
+                        node_info=get_node_info(),
+                    )
+                )
+                pre = perf_counter()
+
+            return connection, cursor
+
+    def _add_standard_queries(
+        self, statements: Sequence[SnowflakeStatement], **kwargs
+    ) -> Tuple[Connection, Any]:
+        # consecutive queries are batched, begin and commit run on their own so the
+        # returned cursor holds the result of the last query, e.g. the rows a DML changed
+        for is_query, group in itertools.groupby(
+            statements, key=lambda statement: statement.kind == StatementKind.Query
+        ):
+            if is_query:
+                connection, cursor = self._add_queries(list(group), **kwargs)
+                continue
+            for statement in group:
+                # Even though we turn off transactions by default for Snowflake,
+                # the user/macro has passed them *explicitly*, probably to wrap a DML statement
+                # This also has the effect of ignoring "commit" in the RunResult for this model
+                # https://github.com/dbt-labs/dbt-snowflake/issues/147
+                if statement.kind == StatementKind.Begin:
+                    super().add_begin_query()
+                else:
+                    super().add_commit_query()
+        return connection, cursor
+
+    def _add_queries(
+        self, statements: Sequence[SnowflakeStatement], **kwargs
+    ) -> Tuple[Connection, Any]:
+        if self._can_batch_statements(statements, kwargs.get("bindings")):
+            return self._add_multi_statement_query(statements, **kwargs)
+
+        for statement in statements:
+            # This adds a query comment to *every* statement
+            # https://github.com/dbt-labs/dbt-snowflake/issues/140
+            connection, cursor = self.add_standard_query(statement.sql, **kwargs)
         return connection, cursor
 
     def _raise_cursor_not_found_error(self, sql: str):
@@ -627,11 +1487,31 @@ class SnowflakeConnectionManager(SQLConnectionManager):
     def release(self):
         """Reuse connections by deferring release until adapter context manager in core
         resets adapters. This cleanup_all happens before Python teardown. Idle connections
-        incur no costs while waiting in the connection pool."""
+        incur no costs while waiting in the connection pool.
+
+        With `pool_connections`, the session goes back to the pool instead, so any thread
+        can reuse it."""
+        if self._pools_connections(self.profile.credentials):
+            with self.lock:
+                connection = self.get_if_exists()
+            if connection is not None and connection.state == ConnectionState.OPEN:
+                self._check_in(connection)
+            return
         if self.profile.credentials.reuse_connections:
             return
         super().release()
 
+    def cleanup_all(self) -> None:
+        if not self._pools_connections(self.profile.credentials):
+            return super().cleanup_all()
+        # the sessions stay open in the pool, for later invocations in this process
+        with self.lock:
+            for connection in self.thread_connections.values():
+                if connection.state == ConnectionState.OPEN:
+                    self._check_in(connection)
+            self.thread_connections.clear()
+        logger.debug(f"Snowflake connection pool: {CONNECTION_POOL.stats}")
+
     @classmethod
     def data_type_code_to_name(cls, type_code: Union[int, str]) -> str:
         assert isinstance(type_code, int)
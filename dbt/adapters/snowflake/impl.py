@@ -1,8 +1,42 @@
-from dataclasses import dataclass
-from typing import Mapping, Any, Optional, List, Union, Dict, FrozenSet, Tuple, TYPE_CHECKING
+import datetime
+import functools
+import os
+import re
+import tempfile
+import threading
+from concurrent.futures import Future, as_completed
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import (
+    Iterable,
+    Mapping,
+    Any,
+    Optional,
+    List,
+    Union,
+    Dict,
+    FrozenSet,
+    Tuple,
+    Set,
+    TYPE_CHECKING,
+    cast,
+)
 
-from dbt.adapters.base.impl import AdapterConfig, ConstraintSupport
+from dbt.adapters.base.impl import (
+    GET_CATALOG_MACRO_NAME,
+    GET_CATALOG_RELATIONS_MACRO_NAME,
+    GET_RELATION_LAST_MODIFIED_MACRO_NAME,
+    AdapterConfig,
+    ConstraintSupport,
+    FreshnessResponse,
+    catch_as_completed,
+)
 from dbt.adapters.base.meta import available
+from dbt.adapters.base.relation import BaseRelation, InformationSchema
+from dbt.adapters.contracts.connection import AdapterResponse, Connection
+from dbt.adapters.contracts.macros import MacroResolverProtocol
+from dbt.adapters.contracts.relation import ComponentName, Path, Policy, RelationConfig
+from dbt.adapters.events.logging import AdapterLogger
 from dbt.adapters.capability import CapabilityDict, CapabilitySupport, Support, Capability
 from dbt.adapters.sql import SQLAdapter
 from dbt.adapters.sql.impl import (
@@ -18,17 +52,95 @@ from dbt_common.contracts.metadata import (
     ColumnMetadata,
 )
 from dbt_common.exceptions import CompilationError, DbtDatabaseError, DbtRuntimeError
-from dbt_common.utils import filter_null_values
+from dbt_common.utils import executor, filter_null_values
+from dbt_common.utils.executor import ConnectingExecutor
 
-from dbt.adapters.snowflake.relation_configs import SnowflakeRelationType
+from dbt.adapters.snowflake.relation_configs import SnowflakeQuotePolicy, SnowflakeRelationType
 from dbt.adapters.snowflake import SnowflakeColumn
 from dbt.adapters.snowflake import SnowflakeConnectionManager
 from dbt.adapters.snowflake import SnowflakeRelation
+from dbt.adapters.snowflake.column_cache import ColumnCache
+from dbt.adapters.snowflake.connections import SessionSetting
+from dbt.adapters.snowflake.persistent_cache import PersistentCache
 
 if TYPE_CHECKING:
     import agate
 
+logger = AdapterLogger("Snowflake")
+
 SHOW_OBJECT_METADATA_MACRO_NAME = "snowflake__show_object_metadata"
+LIST_RELATIONS_IN_DATABASE_MACRO_NAME = "snowflake__list_relations_in_database"
+GET_RELATIONS_CHANGED_SINCE_MACRO_NAME = "snowflake__get_relations_changed_since"
+GET_CATALOG_LAST_ALTERED_MACRO_NAME = "snowflake__get_catalog_last_altered"
+GET_COLUMNS_IN_RELATIONS_MACRO_NAME = "snowflake__get_columns_in_relations"
+
+# commands that run queries for many nodes at once, the only ones sessions are prewarmed for
+PREWARM_COMMANDS = frozenset(
+    ("build", "clone", "freshness", "generate", "retry", "run", "seed", "snapshot", "test")
+)
+
+
+def _json_value(value: Any) -> Any:
+    # json can't store the decimals and dates of agate rows, so they are stored with their
+    # type and turned back into the same values by _from_json_value()
+    if isinstance(value, Decimal):
+        return {"decimal": str(value)}
+    if isinstance(value, datetime.datetime):
+        return {"datetime": value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {"date": value.isoformat()}
+    return value
+
+
+def _from_json_value(value: Any) -> Any:
+    if not isinstance(value, dict):
+        return value
+    ((kind, text),) = value.items()
+    if kind == "decimal":
+        return Decimal(text)
+    if kind == "datetime":
+        return datetime.datetime.fromisoformat(text)
+    return datetime.date.fromisoformat(text)
+
+
+# the relation type of each `kind` in the output of `show objects`, anything else is external
+_SHOW_OBJECTS_KINDS = {
+    relation_type.upper(): relation_type for relation_type in SnowflakeRelationType
+}
+
+
+def _show_objects_relation_type(kind: Any, is_dynamic: Any) -> SnowflakeRelationType:
+    """Return the type of a relation from its `kind` and `is_dynamic` in `show objects`."""
+    relation_type = _SHOW_OBJECTS_KINDS.get(kind)
+    if relation_type is None:
+        relation_type = _SHOW_OBJECTS_KINDS.get(str(kind).upper(), SnowflakeRelationType.External)
+    if relation_type == SnowflakeRelationType.Table and is_dynamic == "Y":
+        return SnowflakeRelationType.DynamicTable
+    return relation_type
+
+
+# `show objects` returns names as they are stored, which only match when quoted. Relations
+# never change their policies in place, so they can all share these.
+_SHOW_OBJECTS_QUOTE_POLICY = SnowflakeQuotePolicy(database=True, schema=True, identifier=True)
+_SHOW_OBJECTS_INCLUDE_POLICY = Policy()
+
+
+@dataclass
+class _RelationChanges:
+    # the rows of the objects altered since a watermark, and their hashes, by name
+    relations: Dict[str, List[str]] = field(default_factory=dict)
+    hashes: Dict[str, int] = field(default_factory=dict)
+    # what the schema holds now: how many objects, the xor of their hashes and when the
+    # latest of them was altered
+    object_count: int = 0
+    fingerprint: int = 0
+    watermark: Optional[str] = None
+
+
+@dataclass
+class _ThreadingConfig:
+    args: Any
+    threads: Optional[int]
 
 
 @dataclass
@@ -43,12 +155,14 @@ class SnowflakeConfig(AdapterConfig):
     tmp_relation_type: Optional[str] = None
     merge_update_columns: Optional[str] = None
     target_lag: Optional[str] = None
+    bulk_load: Optional[bool] = None
 
 
 class SnowflakeAdapter(SQLAdapter):
     Relation = SnowflakeRelation
     Column = SnowflakeColumn
     ConnectionManager = SnowflakeConnectionManager
+    connections: SnowflakeConnectionManager
 
     AdapterSpecificConfigs = SnowflakeConfig
 
@@ -60,6 +174,11 @@ class SnowflakeAdapter(SQLAdapter):
         ConstraintType.foreign_key: ConstraintSupport.NOT_ENFORCED,
     }
 
+    # relations filtered on by a single get_catalog_relations query
+    CATALOG_RELATIONS_CHUNK_SIZE = 1000
+    # sources filtered on by a single get_relation_last_modified query
+    LAST_MODIFIED_CHUNK_SIZE = 1000
+
     _capabilities: CapabilityDict = CapabilityDict(
         {
             Capability.SchemaMetadataByRelations: CapabilitySupport(support=Support.Full),
@@ -69,6 +188,24 @@ class SnowflakeAdapter(SQLAdapter):
         }
     )
 
+    def __init__(self, config, mp_context) -> None:
+        super().__init__(config, mp_context)
+        self._column_cache = ColumnCache()
+        self.connections.altered_relations_callbacks.append(self._column_cache.invalidate)
+        self._prewarm_lock = threading.Lock()
+        self._prewarmed = False
+
+    def acquire_connection(self, name: Optional[str] = None) -> Connection:
+        # sessions are prewarmed once the first connection is needed, so commands that never
+        # run a query, e.g. parse or ls, don't log in
+        if not self._prewarmed:
+            with self._prewarm_lock:
+                if not self._prewarmed:
+                    self._prewarmed = True
+                    if getattr(self.config.args, "which", None) in PREWARM_COMMANDS:
+                        self.connections.prewarm()
+        return super().acquire_connection(name)
+
     @classmethod
     def date_function(cls):
         return "CURRENT_TIMESTAMP()"
@@ -82,6 +219,194 @@ class SnowflakeAdapter(SQLAdapter):
         lowered = table.rename(column_names=[c.lower() for c in table.column_names])
         return super()._catalog_filter_table(lowered, used_schemas)
 
+    def _get_one_catalog(
+        self,
+        information_schema: InformationSchema,
+        schemas: Set[str],
+        used_schemas: FrozenSet[Tuple[str, str]],
+    ) -> "agate.Table":
+        if not self.config.credentials.catalog_cache_path:
+            return super()._get_one_catalog(information_schema, schemas, used_schemas)
+        table = self._get_one_catalog_incrementally(information_schema, schemas)
+        return self._catalog_filter_table(table, used_schemas)
+
+    def _get_one_catalog_incrementally(
+        self, information_schema: InformationSchema, schemas: Set[str]
+    ) -> "agate.Table":
+        """Build the catalog of some schemas in a database from the catalog stored by the last
+        invocation, only fetching the columns of tables altered since then.
+
+        Listing the tables with when they were last altered is cheap compared to reading
+        information_schema.columns, which is what makes generating the full catalog slow.
+        """
+        from dbt_common.clients.agate_helper import table_from_data_flat
+
+        credentials = self.config.credentials
+        catalog_cache = PersistentCache(
+            os.path.join(
+                credentials.catalog_cache_path,
+                "{}.json".format(re.sub(r"[^\w.-]", "_", str(information_schema.database))),
+            )
+        )
+        key = "/".join(
+            str(part) for part in (credentials.account, credentials.user, credentials.role)
+        )
+        entry = catalog_cache.get(key) or {"column_names": None, "schemas": {}}
+        # tables by name by schema, each with when it was last altered and its catalog rows
+        stored: Dict[str, Dict[str, Dict[str, Any]]] = entry["schemas"]
+
+        kwargs = {"information_schema": information_schema, "schemas": schemas}
+        last_altered: Dict[str, Dict[str, Any]] = {}
+        for schema, name, altered in self.execute_macro(
+            GET_CATALOG_LAST_ALTERED_MACRO_NAME, kwargs=kwargs
+        ):
+            last_altered.setdefault(schema, {})[name] = _json_value(altered)
+        changed = [
+            (schema, name)
+            for schema, tables in last_altered.items()
+            for name, altered in tables.items()
+            if stored.get(schema, {}).get(name, {}).get("last_altered") != altered
+        ]
+
+        column_names = entry["column_names"]
+        fetched: Dict[Tuple[str, str], List[List[Any]]] = {}
+        if changed or column_names is None:
+            if column_names is None or len(changed) > self.MAX_SCHEMA_METADATA_RELATIONS:
+                table = cast(
+                    "agate.Table", self.execute_macro(GET_CATALOG_MACRO_NAME, kwargs=kwargs)
+                )
+            else:
+                # the names are listed as Snowflake stores them, so they are matched exactly
+                relations = [
+                    self.Relation.create(
+                        database=information_schema.database,
+                        schema=schema,
+                        identifier=name,
+                        quote_policy=_SHOW_OBJECTS_QUOTE_POLICY,
+                    )
+                    for schema, name in changed
+                ]
+                table = cast(
+                    "agate.Table",
+                    self.execute_macro(
+                        GET_CATALOG_RELATIONS_MACRO_NAME,
+                        kwargs={"information_schema": information_schema, "relations": relations},
+                    ),
+                )
+            column_names = [column_name.lower() for column_name in table.column_names]
+            schema_index = column_names.index("table_schema")
+            name_index = column_names.index("table_name")
+            for row in table.rows:
+                values = [_json_value(value) for value in row.values()]
+                fetched.setdefault((values[schema_index], values[name_index]), []).append(values)
+
+        # other schemas are kept as they are, tables that are no longer listed were dropped
+        requested = {schema.upper() for schema in schemas}
+        catalog = {
+            schema: tables for schema, tables in stored.items() if schema.upper() not in requested
+        }
+        for schema, tables in last_altered.items():
+            catalog[schema] = {}
+            for name, altered in tables.items():
+                if (schema, name) in fetched:
+                    catalog[schema][name] = {
+                        "last_altered": altered,
+                        "rows": fetched[(schema, name)],
+                    }
+                elif stored.get(schema, {}).get(name, {}).get("last_altered") == altered:
+                    catalog[schema][name] = stored[schema][name]
+
+        catalog_cache.set(key, {"column_names": column_names, "schemas": catalog})
+        catalog_cache.save()
+
+        return table_from_data_flat(
+            [
+                dict(zip(column_names, map(_from_json_value, row)))
+                for schema in last_altered
+                for table in catalog[schema].values()
+                for row in table["rows"]
+            ],
+            column_names,
+        )
+
+    def get_catalog_by_relations(
+        self, used_schemas: FrozenSet[Tuple[str, str]], relations: Set[BaseRelation]
+    ) -> Tuple["agate.Table", List[Exception]]:
+        """Get the catalog of the given relations, splitting the relations of each database into
+        chunks of `CATALOG_RELATIONS_CHUNK_SIZE` that are queried concurrently, each on its own
+        connection, so no single query has to filter on thousands of relations."""
+        size = self.CATALOG_RELATIONS_CHUNK_SIZE
+        with self._metadata_executor() as tpe:
+            futures: List[Future["agate.Table"]] = []
+            relations_by_schema = self._get_catalog_relations_by_info_schema(relations)
+            for info_schema, info_schema_relations in relations_by_schema.items():
+                # the same relations always make the same chunks, and so the same queries
+                info_schema_relations.sort(key=lambda r: (r.schema or "", r.identifier or ""))
+                for start in range(0, len(info_schema_relations), size):
+                    chunk = info_schema_relations[start : start + size]
+                    name = f"{info_schema.database}.information_schema_{start // size}"
+                    futures.append(
+                        tpe.submit_connected(
+                            self,
+                            name,
+                            self._get_one_catalog_by_relations,
+                            info_schema,
+                            chunk,
+                            used_schemas,
+                        )
+                    )
+
+            return catch_as_completed(futures)
+
+    def calculate_freshness_from_metadata_batch(
+        self,
+        sources: List[BaseRelation],
+        macro_resolver: Optional[MacroResolverProtocol] = None,
+    ) -> Tuple[List[Optional[AdapterResponse]], Dict[BaseRelation, FreshnessResponse]]:
+        """Calculate the freshness of sources from their last_altered time, with one query per
+        `LAST_MODIFIED_CHUNK_SIZE` sources of a database. Sources are grouped by schema
+        within a database, and the queries run concurrently, each on its own connection."""
+        source_by_name = {
+            (
+                source.path.get_lowered_part(ComponentName.Schema),
+                source.path.get_lowered_part(ComponentName.Identifier),
+            ): source
+            for source in sources
+        }
+
+        size = self.LAST_MODIFIED_CHUNK_SIZE
+        with self._metadata_executor() as tpe:
+            futures = []
+            sources_by_info_schema = self._get_catalog_relations_by_info_schema(sources)
+            for info_schema, info_schema_sources in sources_by_info_schema.items():
+                info_schema_sources.sort(key=lambda r: (r.schema or "", r.identifier or ""))
+                for start in range(0, len(info_schema_sources), size):
+                    futures.append(
+                        tpe.submit_connected(
+                            self,
+                            f"{info_schema.database}.last_modified_{start // size}",
+                            self.execute_macro,
+                            GET_RELATION_LAST_MODIFIED_MACRO_NAME,
+                            kwargs={
+                                "information_schema": info_schema,
+                                "relations": info_schema_sources[start : start + size],
+                            },
+                            macro_resolver=macro_resolver,
+                            needs_conn=True,
+                        )
+                    )
+
+            adapter_responses: List[Optional[AdapterResponse]] = []
+            freshness_responses: Dict[BaseRelation, FreshnessResponse] = {}
+            for future in futures:
+                result = future.result()
+                adapter_responses.append(result.response)
+                for row in result.table:
+                    name, freshness_response = self._parse_freshness_row(row, result.table)
+                    freshness_responses[source_by_name[name]] = freshness_response
+
+        return adapter_responses, freshness_responses
+
     def _make_match_kwargs(self, database, schema, identifier):
         quoting = self.config.quoting
         if identifier is not None and quoting["identifier"] is False:
@@ -98,15 +423,50 @@ class SnowflakeAdapter(SQLAdapter):
         )
 
     def _get_warehouse(self) -> str:
+        session = self.connections.get_session_state()
+        warehouse = session.get(SessionSetting.Warehouse)
+        if warehouse is not None:
+            return warehouse
+
         _, table = self.execute("select current_warehouse() as warehouse", fetch=True)
         if len(table) == 0 or len(table[0]) == 0:
             # can this happen?
             raise DbtRuntimeError("Could not get current warehouse: no results")
-        return str(table[0][0])
+        session.warehouse = str(table[0][0])
+        return session.warehouse
 
-    def _use_warehouse(self, warehouse: str):
+    def _use_warehouse(self, warehouse: str, defer: bool = False):
         """Use the given warehouse. Quotes are never applied."""
-        self.execute("use warehouse {}".format(warehouse))
+        self.connections.change_session(SessionSetting.Warehouse, warehouse, defer=defer)
+
+    def _get_query_tag(self) -> str:
+        session = self.connections.get_session_state()
+        query_tag = session.get(SessionSetting.QueryTag)
+        if query_tag is not None:
+            return query_tag
+
+        _, table = self.execute("show parameters like 'query_tag' in session", fetch=True)
+        if len(table) == 0:
+            raise DbtRuntimeError("Could not get current query tag: no results")
+        session.query_tag = str(table[0]["value"] or "")
+        return session.query_tag
+
+    @available
+    def set_query_tag(self, query_tag: str) -> str:
+        """Tag the statements that follow on this connection, returning the tag to restore
+        with unset_query_tag(). The session's tag is only looked up once per connection, and
+        the change is made with the next statement, if it is needed at all."""
+        original_query_tag = self._get_query_tag()
+        self.connections.change_session(SessionSetting.QueryTag, query_tag, defer=True)
+        return original_query_tag
+
+    @available
+    def unset_query_tag(self, original_query_tag: Optional[str]) -> None:
+        """Restore the tag returned by set_query_tag(). This is deferred like setting it, so
+        consecutive models with the same tag don't change it back and forth."""
+        self.connections.change_session(
+            SessionSetting.QueryTag, original_query_tag or "", defer=True
+        )
 
     def pre_model_hook(self, config: Mapping[str, Any]) -> Optional[str]:
         default_warehouse = self.config.credentials.warehouse
@@ -119,7 +479,9 @@ class SnowflakeAdapter(SQLAdapter):
 
     def post_model_hook(self, config: Mapping[str, Any], context: Optional[str]) -> None:
         if context is not None:
-            self._use_warehouse(context)
+            # the next model on this connection often uses the same warehouse, switching
+            # back when the next statement runs lets its pre_model_hook skip both switches
+            self._use_warehouse(context, defer=True)
 
     def list_schemas(self, database: str) -> List[str]:
         try:
@@ -133,13 +495,23 @@ class SnowflakeAdapter(SQLAdapter):
         return [row["name"] for row in results]
 
     def get_columns_in_relation(self, relation):
+        # described at most once until a statement creates, alters or drops the relation
+        name = relation.as_case_sensitive()
+        key = (name.database, name.schema, name.identifier)
+        columns = self._column_cache.get(key)
+        if columns is not None:
+            return columns
+
+        generation = self._column_cache.generation
         try:
-            return super().get_columns_in_relation(relation)
+            columns = super().get_columns_in_relation(relation)
         except DbtDatabaseError as exc:
             if "does not exist or not authorized" in str(exc):
-                return []
+                columns = []
             else:
                 raise
+        self._column_cache.set(key, columns, generation)
+        return columns
 
     def _show_object_metadata(self, relation: SnowflakeRelation) -> Optional[dict]:
         try:
@@ -161,7 +533,97 @@ class SnowflakeAdapter(SQLAdapter):
         if not object_metadata:
             return None
 
-        row = object_metadata[0]
+        columns = [(c.column, c.dtype) for c in self.get_columns_in_relation(relation)]
+        return self._catalog_table_from_object_metadata(object_metadata[0], columns)
+
+    def get_catalog_for_relations(
+        self, relations: Iterable[SnowflakeRelation]
+    ) -> Dict[SnowflakeRelation, Optional[CatalogTable]]:
+        """Get the catalog of many relations at once, like `get_catalog_for_single_relation`.
+
+        Instead of two queries per relation, this lists the objects of each schema once and
+        reads the columns of all the relations in a database with a single query. Relations
+        that don't exist map to None.
+        """
+        relations = list(relations)
+        # the names as Snowflake stores them, which is what both queries return
+        names = {relation: relation.as_case_sensitive() for relation in relations}
+        schemas = {
+            (name.database, name.schema): name.without_identifier() for name in names.values()
+        }
+
+        objects: Dict[Tuple[Optional[str], ...], "agate.Row"] = {}
+        with self._metadata_executor() as tpe:
+            futures = [
+                tpe.submit_connected(
+                    self,
+                    f"catalog_{database}_{schema}",
+                    self._show_objects_for_catalog,
+                    schema_relation,
+                )
+                for (database, schema), schema_relation in schemas.items()
+            ]
+            for future in as_completed(futures):
+                for row in future.result():
+                    key = (row["database_name"], row["schema_name"], row["name"])
+                    objects[key] = row
+
+            existing = [
+                name
+                for name in names.values()
+                if (name.database, name.schema, name.identifier) in objects
+            ]
+            futures = [
+                tpe.submit_connected(
+                    self,
+                    f"catalog_{information_schema.database}",
+                    self.execute_macro,
+                    GET_COLUMNS_IN_RELATIONS_MACRO_NAME,
+                    kwargs={
+                        "information_schema": information_schema,
+                        "relations": database_relations,
+                    },
+                )
+                for information_schema, database_relations in self._get_catalog_relations_by_info_schema(
+                    existing
+                ).items()
+            ]
+            columns: Dict[Tuple[Optional[str], ...], List[Tuple[str, str]]] = {}
+            for future in as_completed(futures):
+                for row in future.result():
+                    key = (row["table_database"], row["table_schema"], row["table_name"])
+                    columns.setdefault(key, []).append((row["column_name"], row["column_type"]))
+
+        catalogs: Dict[SnowflakeRelation, Optional[CatalogTable]] = {}
+        for relation, name in names.items():
+            key = (name.database, name.schema, name.identifier)
+            if key in objects:
+                catalogs[relation] = self._catalog_table_from_object_metadata(
+                    objects[key], columns.get(key, [])
+                )
+            else:
+                catalogs[relation] = None
+        return catalogs
+
+    def _show_objects_for_catalog(
+        self, schema_relation: SnowflakeRelation
+    ) -> Iterable["agate.Row"]:
+        try:
+            return self.execute_macro(
+                LIST_RELATIONS_MACRO_NAME, kwargs={"schema_relation": schema_relation}
+            )
+        except DbtDatabaseError as exc:
+            # the relations of a schema that doesn't exist or we can't see are missing, any
+            # other error, e.g. a timeout, says nothing about them
+            if "does not exist or not authorized" in str(exc):
+                return []
+            raise
+
+    def _catalog_table_from_object_metadata(
+        self, row: "agate.Row", columns: List[Tuple[str, str]]
+    ) -> CatalogTable:
+        """Build a catalog table from a row of `show objects` and the (name, type) of each
+        of its columns, in order."""
 
         is_dynamic = row.get("is_dynamic") in ("Y", "YES")
         kind = row.get("kind")
@@ -209,8 +671,8 @@ class SnowflakeAdapter(SQLAdapter):
         }
 
         catalog_columns = {
-            c.column: ColumnMetadata(type=c.dtype, index=i + 1, name=c.column)
-            for i, c in enumerate(self.get_columns_in_relation(relation))
+            name: ColumnMetadata(type=dtype, index=i + 1, name=name)
+            for i, (name, dtype) in enumerate(columns)
         }
 
         return CatalogTable(
@@ -219,6 +681,231 @@ class SnowflakeAdapter(SQLAdapter):
             stats=stats_dict,
         )
 
+    def _metadata_executor(self) -> ConnectingExecutor:
+        """An executor that runs at most `max_metadata_queries` metadata queries at once, each
+        on its own connection. Without the setting this is the same as `threads`."""
+        threads = self.config.credentials.max_metadata_queries or self.config.threads
+        return executor(_ThreadingConfig(self.config.args, threads))
+
+    def list_relations_in_schemas(
+        self, schema_relations: Iterable[BaseRelation]
+    ) -> List[SnowflakeRelation]:
+        """List the relations in all of the given schemas, running the listing queries
+        concurrently.
+
+        With `list_relations_per_database`, schemas that share a database are listed with a
+        single query for the whole database, unless it has too many objects, see
+        `_list_relations_in_database()`.
+        """
+        schemas_by_database: Dict[Optional[str], List[BaseRelation]] = {}
+        for schema_relation in schema_relations:
+            schemas_by_database.setdefault(schema_relation.database, []).append(schema_relation)
+
+        relation_cache = None
+        list_relations = self.list_relations_without_caching
+        if self.config.credentials.relation_cache_path:
+            relation_cache = PersistentCache(self.config.credentials.relation_cache_path)
+            list_relations = functools.partial(
+                self._list_relations_with_relation_cache, relation_cache=relation_cache
+            )
+
+        relations: List[SnowflakeRelation] = []
+        with self._metadata_executor() as tpe:
+
+            def submit_schema(schema_relation: BaseRelation) -> Future:
+                return tpe.submit_connected(
+                    self,
+                    f"list_{schema_relation.database}_{schema_relation.schema}",
+                    list_relations,
+                    schema_relation,
+                )
+
+            schema_futures: List[Future] = []
+            database_futures: Dict[Future, List[BaseRelation]] = {}
+            for database, schemas in schemas_by_database.items():
+                if (
+                    self.config.credentials.list_relations_per_database
+                    and relation_cache is None
+                    and database is not None
+                    and len(schemas) > 1
+                ):
+                    future = tpe.submit_connected(
+                        self, f"list_{database}", self._list_relations_in_database, schemas
+                    )
+                    database_futures[future] = schemas
+                else:
+                    schema_futures.extend(submit_schema(schema) for schema in schemas)
+
+            # if we can't read the relations we need to just raise anyway,
+            # so just call future.result() and let that raise on failure
+            for future in as_completed(database_futures):
+                database_relations = future.result()
+                if database_relations is None:
+                    schema_futures.extend(map(submit_schema, database_futures[future]))
+                else:
+                    relations.extend(database_relations)
+
+            for future in as_completed(schema_futures):
+                relations.extend(future.result())
+
+        if relation_cache is not None:
+            relation_cache.save()
+        return relations
+
+    def _list_relations_with_relation_cache(
+        self, schema_relation: BaseRelation, relation_cache: PersistentCache
+    ) -> List[SnowflakeRelation]:
+        """List the relations in a schema, starting from the relations stored by the last
+        invocation and only fetching the objects altered since then.
+
+        The stored relations are only used if, with the changes applied, they add up to the
+        number of objects in the schema and their hashes to the fingerprint of its objects.
+        Otherwise something was dropped, undropped or renamed, and the schema is listed in
+        full.
+        """
+        credentials = self.config.credentials
+        key = "/".join(
+            str(part)
+            for part in (
+                credentials.account,
+                credentials.user,
+                credentials.role,
+                schema_relation.database,
+                schema_relation.schema,
+            )
+        )
+        entry = relation_cache.get(key)
+        if entry and "hashes" not in entry:
+            # stored before fingerprints were
+            entry = None
+
+        changes = self._get_relations_changed_since(
+            schema_relation, entry["watermark"] if entry else None
+        )
+        listed, hashes = changes.relations, changes.hashes
+        if entry:
+            listed = {row[2]: row for row in entry["relations"]}
+            listed.update(changes.relations)
+            hashes = {**entry["hashes"], **changes.hashes}
+            fingerprint = 0
+            for identifier in listed:
+                fingerprint ^= hashes[identifier]
+            if len(listed) != changes.object_count or fingerprint != changes.fingerprint:
+                logger.debug(f"Cached relations of {schema_relation} are stale, listing again")
+                changes = self._get_relations_changed_since(schema_relation, None)
+                listed, hashes = changes.relations, changes.hashes
+
+        rows = list(listed.values())
+        relation_cache.set(
+            key,
+            {
+                "watermark": changes.watermark,
+                "relations": rows,
+                "hashes": {identifier: hashes[identifier] for identifier in listed},
+            },
+        )
+        return [
+            self.Relation(
+                path=Path(database, schema, identifier),
+                type=SnowflakeRelationType(relation_type),
+                include_policy=_SHOW_OBJECTS_INCLUDE_POLICY,
+                quote_policy=_SHOW_OBJECTS_QUOTE_POLICY,
+            )
+            for database, schema, identifier, relation_type in rows
+        ]
+
+    def _get_relations_changed_since(
+        self, schema_relation: BaseRelation, watermark: Optional[str]
+    ) -> _RelationChanges:
+        """Return the objects in a schema altered since the watermark, all of them without
+        one, along with what the schema holds now."""
+        kwargs = {"schema_relation": schema_relation, "watermark": watermark}
+        try:
+            results = cast(
+                "agate.Table",
+                self.execute_macro(GET_RELATIONS_CHANGED_SINCE_MACRO_NAME, kwargs=kwargs),
+            )
+        except DbtDatabaseError as exc:
+            if "does not exist" in str(exc):
+                return _RelationChanges()
+            raise
+
+        changes = _RelationChanges()
+        for row in results.rows:
+            (
+                database,
+                schema,
+                identifier,
+                kind,
+                is_dynamic,
+                name_hash,
+                count,
+                fingerprint,
+                last_altered,
+            ) = row
+            if identifier is None:
+                changes.object_count = int(count)
+                changes.fingerprint = int(fingerprint)
+                changes.watermark = last_altered.isoformat() if last_altered else None
+            else:
+                relation_type = _show_objects_relation_type(kind, is_dynamic)
+                changes.relations[identifier] = [database, schema, identifier, str(relation_type)]
+                changes.hashes[identifier] = int(name_hash)
+        return changes
+
+    def _list_relations_in_database(
+        self, schema_relations: List[BaseRelation], max_results_per_schema: int = 10000
+    ) -> Optional[List[SnowflakeRelation]]:
+        """List the relations in schemas of the same database with `show objects in database`,
+        keeping the rows of the given schemas.
+
+        The listing is limited to `max_results_per_schema` objects for each of the schemas,
+        what listing them one at a time would fetch in a single page each. Returns None if the
+        database has more objects than that. `show objects` can only continue from an object
+        name, not from a schema, so those databases need to be listed one schema at a time.
+        """
+        max_results = max_results_per_schema * len(schema_relations)
+        database_relation = schema_relations[0].include(schema=False, identifier=False)
+        kwargs = {"database_relation": database_relation, "max_results": max_results}
+        try:
+            results = self.execute_macro(LIST_RELATIONS_IN_DATABASE_MACRO_NAME, kwargs=kwargs)
+        except DbtDatabaseError as exc:
+            if "does not exist" in str(exc):
+                return []
+            raise
+
+        if len(results) >= max_results:
+            return None
+
+        # the names as Snowflake stores them, quoted schemas can differ only by case
+        schemas = {
+            cast(SnowflakeRelation, schema_relation).as_case_sensitive().schema
+            for schema_relation in schema_relations
+        }
+        return [
+            relation
+            for relation in self._parse_list_relations_results(results)
+            if relation.schema in schemas
+        ]
+
+    def _relations_cache_for_schemas(
+        self,
+        relation_configs: Iterable[RelationConfig],
+        cache_schemas: Optional[Set[BaseRelation]] = None,
+    ) -> None:
+        if not cache_schemas:
+            cache_schemas = self._get_cache_schemas(relation_configs)
+
+        for relation in self.list_relations_in_schemas(cache_schemas):
+            self.cache.add(relation)
+
+        # it's possible that there were no relations in some schemas. We want
+        # to insert the schemas we query into the cache's `.schemas` attribute
+        # so we can check it later
+        self.cache.update_schemas(
+            {(relation.database, relation.schema) for relation in cache_schemas if relation.schema}
+        )
+
     def list_relations_without_caching(
         self, schema_relation: SnowflakeRelation
     ) -> List[SnowflakeRelation]:
@@ -233,37 +920,37 @@ class SnowflakeAdapter(SQLAdapter):
                 return []
             raise
 
-        # this can be reduced to always including `is_dynamic` once bundle `2024_03` is mandatory
-        columns = ["database_name", "schema_name", "name", "kind"]
-        if "is_dynamic" in results.column_names:
-            columns.append("is_dynamic")
+        return self._parse_list_relations_results(results)
 
-        return [self._parse_list_relations_result(result) for result in results.select(columns)]
+    def _parse_list_relations_results(self, results: "agate.Table") -> List[SnowflakeRelation]:
+        """Turn the rows of `show objects` into relations.
 
-    def _parse_list_relations_result(self, result: "agate.Row") -> SnowflakeRelation:
-        # this can be reduced to always including `is_dynamic` once bundle `2024_03` is mandatory
-        try:
-            database, schema, identifier, relation_type, is_dynamic = result
-        except ValueError:
-            database, schema, identifier, relation_type = result
-            is_dynamic = "N"
+        This runs for every object in every cached schema, so columns are looked up once and
+        the rows are read directly instead of through `agate.Table.select()`.
+        """
+        column_names = list(results.column_names)
+        database_index = column_names.index("database_name")
+        schema_index = column_names.index("schema_name")
+        name_index = column_names.index("name")
+        kind_index = column_names.index("kind")
+        # this can be removed once bundle `2024_03` is mandatory and `is_dynamic` always exists
+        dynamic_index = column_names.index("is_dynamic") if "is_dynamic" in column_names else None
 
-        try:
-            relation_type = self.Relation.get_relation_type(relation_type.lower())
-        except ValueError:
-            relation_type = self.Relation.External
-
-        if relation_type == self.Relation.Table and is_dynamic == "Y":
-            relation_type = self.Relation.DynamicTable
-
-        quote_policy = {"database": True, "schema": True, "identifier": True}
-        return self.Relation.create(
-            database=database,
-            schema=schema,
-            identifier=identifier,
-            type=relation_type,
-            quote_policy=quote_policy,
-        )
+        relation_cls = self.Relation
+        relations = []
+        for values in (row.values() for row in results.rows):
+            relation_type = _show_objects_relation_type(
+                values[kind_index], None if dynamic_index is None else values[dynamic_index]
+            )
+            relations.append(
+                relation_cls(
+                    path=Path(values[database_index], values[schema_index], values[name_index]),
+                    type=relation_type,
+                    include_policy=_SHOW_OBJECTS_INCLUDE_POLICY,
+                    quote_policy=_SHOW_OBJECTS_QUOTE_POLICY,
+                )
+            )
+        return relations
 
     def quote_seed_column(self, column: str, quote_config: Optional[bool]) -> str:
         quote_columns: bool = False
@@ -283,6 +970,35 @@ class SnowflakeAdapter(SQLAdapter):
         else:
             return column
 
+    @available
+    def bulk_load_seed(
+        self, relation: SnowflakeRelation, agate_table: "agate.Table", column_list: str
+    ) -> str:
+        """Load a seed's rows by uploading them as a compressed csv file to the table's stage
+        and copying them into the table with a single statement, instead of inserting them
+        in batches. Returns the copy statement, so it can be rendered as the compiled seed.
+        """
+        identifier = relation.identifier
+        if relation.quote_policy.identifier:
+            identifier = self.quote(identifier)
+        stage = "@{}.%{}".format(relation.include(identifier=False).render(), identifier)
+
+        copy_sql = (
+            f"copy into {relation.render()} ({column_list}) from {stage} "
+            "file_format = (type = csv skip_header = 1 field_optionally_enclosed_by = '\"' "
+            "escape_unenclosed_field = none null_if = ()) force = true purge = true"
+        )
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            # not named after the relation, quoted identifiers can hold quotes and slashes
+            path = os.path.join(tmp_dir, "seed.csv")
+            agate_table.to_csv(path)
+            uri = "file://" + path.replace("\\", "/")
+            self.execute(f"put '{uri}' {stage} auto_compress = true overwrite = true")
+        self.execute(copy_sql)
+
+        return copy_sql
+
     @available
     def standardize_grants_dict(self, grants_table: "agate.Table") -> dict:
         grants_dict: Dict[str, Any] = {}
@@ -0,0 +1,62 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Optional
+
+from dbt.adapters.events.logging import AdapterLogger
+
+
+logger = AdapterLogger("Snowflake")
+
+
+class PersistentCache:
+    """Metadata kept in a json file between dbt invocations.
+
+    The file is read when the cache is created and written by save(), entries can be read and
+    updated from any thread in between. The cache only ever saves work, so a file that can't
+    be read is treated as empty and a file that can't be written is skipped.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self.path) as f:
+                entries = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable cache file {self.path}: {e}")
+            return {}
+        return entries if isinstance(entries, dict) else {}
+
+    def get(self, key: str) -> Optional[Any]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = value
+
+    def save(self) -> None:
+        with self._lock:
+            data = json.dumps(self._entries)
+
+        # write to a temporary file first, so concurrent invocations never read a partial file
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            try:
+                with os.fdopen(fd, "w") as f:
+                    f.write(data)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
+        except OSError as e:
+            logger.debug(f"Could not write cache file {self.path}: {e}")
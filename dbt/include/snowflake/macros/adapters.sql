@@ -47,6 +47,24 @@
   {% do return(columns) %}
 {% endmacro %}
 
+{% macro snowflake__get_columns_in_relations(information_schema, relations) -%}
+  {%- set sql -%}
+    select
+        table_catalog as "table_database",
+        table_schema as "table_schema",
+        table_name as "table_name",
+        column_name as "column_name",
+        ordinal_position as "column_index",
+        data_type as "column_type"
+    from {{ information_schema }}.columns
+    {{ snowflake__get_catalog_relations_where_clause_sql(relations) }}
+    order by "column_index"
+  {%- endset -%}
+
+  {%- set result = run_query(sql) -%}
+  {{ return(result) }}
+{% endmacro %}
+
 {% macro snowflake__show_object_metadata(relation) %}
   {%- set sql -%}
     show objects in {{ relation.include(identifier=False) }} starts with '{{ relation.identifier }}' limit 1
@@ -134,6 +152,13 @@
 
 {% endmacro %}
 
+{% macro snowflake__list_relations_in_database(database_relation, max_results=10000) %}
+  {%- set sql -%}
+    show objects in database {{ database_relation }} limit {{ max_results }}
+  {%- endset -%}
+  {%- do return(run_query(sql)) -%}
+{% endmacro %}
+
 {% macro snowflake__list_relations_without_caching(schema_relation, max_iter=10, max_results_per_iter=10000) %}
 
   {%- set max_total_results = max_results_per_iter * max_iter -%}
@@ -227,9 +252,8 @@
 {% macro snowflake__set_query_tag() -%}
   {% set new_query_tag = config.get('query_tag') %}
   {% if new_query_tag %}
-    {% set original_query_tag = get_current_query_tag() %}
+    {% set original_query_tag = adapter.set_query_tag(new_query_tag) %}
     {{ log("Setting query_tag to '" ~ new_query_tag ~ "'. Will reset to '" ~ original_query_tag ~ "' after materialization.") }}
-    {% do run_query("alter session set query_tag = '{}'".format(new_query_tag)) %}
     {{ return(original_query_tag)}}
   {% endif %}
   {{ return(none)}}
@@ -246,11 +270,10 @@
   {% if new_query_tag %}
     {% if original_query_tag %}
       {{ log("Resetting query_tag to '" ~ original_query_tag ~ "'.") }}
-      {% do run_query("alter session set query_tag = '{}'".format(original_query_tag)) %}
     {% else %}
       {{ log("No original query_tag, unsetting parameter.") }}
-      {% do run_query("alter session unset query_tag") %}
     {% endif %}
+    {% do adapter.unset_query_tag(original_query_tag) %}
   {% endif %}
 {% endmacro %}
 
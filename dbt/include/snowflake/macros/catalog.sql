@@ -3,11 +3,11 @@
     {% set query %}
         with tables as (
             {{ snowflake__get_catalog_tables_sql(information_schema) }}
-            {{ snowflake__get_catalog_schemas_where_clause_sql(schemas) }}
+            {{ snowflake__get_catalog_schemas_where_clause_sql(schemas, information_schema) }}
         ),
         columns as (
             {{ snowflake__get_catalog_columns_sql(information_schema) }}
-            {{ snowflake__get_catalog_schemas_where_clause_sql(schemas) }}
+            {{ snowflake__get_catalog_schemas_where_clause_sql(schemas, information_schema) }}
         )
         {{ snowflake__get_catalog_results_sql() }}
     {%- endset -%}
@@ -36,6 +36,22 @@
 {%- endmacro %}
 
 
+{% macro snowflake__get_catalog_last_altered(information_schema, schemas) -%}
+
+    {% set query %}
+        select
+            table_schema as "table_schema",
+            table_name as "table_name",
+            to_varchar(convert_timezone('UTC', last_altered), 'yyyy-mm-dd HH24:MI:SS.FF9') as "last_altered"
+        from {{ information_schema }}.tables
+        {{ snowflake__get_catalog_schemas_where_clause_sql(schemas, information_schema) }}
+    {%- endset -%}
+
+    {{ return(run_query(query)) }}
+
+{%- endmacro %}
+
+
 {% macro snowflake__get_catalog_tables_sql(information_schema) -%}
     select
         table_catalog as "table_database",
@@ -100,32 +116,78 @@
 {% endmacro %}
 
 
-{% macro snowflake__get_catalog_schemas_where_clause_sql(schemas) -%}
-    where ({%- for schema in schemas -%}
-        ({{ snowflake__catalog_equals('table_schema', schema) }}){%- if not loop.last %} or {% endif -%}
-    {%- endfor -%})
+{% macro snowflake__catalog_identifier(name, quoted) -%}
+    {#- unquoted names are stored in upper case, quoted names as they were written -#}
+    '{{ snowflake__escape_single_quotes((name if quoted else name | upper) | replace("\\", "\\\\")) }}'
+{%- endmacro %}
+
+
+{% macro snowflake__catalog_in_sql(fields, values, chunk_size=1000) -%}
+    {#-
+        `fields in (values)` on the raw information_schema columns, which Snowflake can prune
+        on, unlike expressions such as upper(field). Long lists are split into several in
+        lists of at most chunk_size values.
+    -#}
+    {%- set column = fields[0] if fields | length == 1 else '(' ~ fields | join(', ') ~ ')' -%}
+    (
+    {%- for chunk in values | batch(chunk_size) %}
+        {{ column }} in (
+            {%- for value in chunk -%}
+                {{ value if fields | length == 1 else '(' ~ value | join(', ') ~ ')' }}{%- if not loop.last %}, {% endif -%}
+            {%- endfor -%}
+        ){%- if not loop.last %} or{% endif -%}
+    {%- endfor %}
+    )
+{%- endmacro %}
+
+
+{% macro snowflake__get_catalog_schemas_where_clause_sql(schemas, information_schema=none) -%}
+    {#- dbt passes schema names lower cased, so only unquoted schemas can be matched exactly -#}
+    {%- if information_schema is none or information_schema.quote_policy.schema -%}
+        where ({%- for schema in schemas -%}
+            ({{ snowflake__catalog_equals('table_schema', schema) }}){%- if not loop.last %} or {% endif -%}
+        {%- endfor -%})
+    {%- else -%}
+        {%- set values = [] -%}
+        {%- for schema in schemas -%}
+            {%- set value = snowflake__catalog_identifier(schema, false) -%}
+            {%- if value not in values -%}
+                {%- do values.append(value) -%}
+            {%- endif -%}
+        {%- endfor -%}
+        where {{ snowflake__catalog_in_sql(['table_schema'], values) }}
+    {%- endif -%}
 {%- endmacro %}
 
 
 {% macro snowflake__get_catalog_relations_where_clause_sql(relations) -%}
+    {%- set schemas = [] -%}
+    {%- set tables = [] -%}
+    {%- for relation in relations -%}
+        {%- if not relation.schema -%}
+            {% do exceptions.raise_compiler_error(
+                '`get_catalog_relations` requires a list of relations, each with a schema'
+            ) %}
+        {%- endif -%}
+        {%- set schema = snowflake__catalog_identifier(relation.schema, relation.quote_policy.schema) -%}
+        {%- if relation.identifier -%}
+            {%- set table = [
+                schema, snowflake__catalog_identifier(relation.identifier, relation.quote_policy.identifier)
+            ] -%}
+            {%- if table not in tables -%}
+                {%- do tables.append(table) -%}
+            {%- endif -%}
+        {%- elif schema not in schemas -%}
+            {%- do schemas.append(schema) -%}
+        {%- endif -%}
+    {%- endfor -%}
     where (
-        {%- for relation in relations -%}
-            {% if relation.schema and relation.identifier %}
-                (
-                    {{ snowflake__catalog_equals('table_schema', relation.schema) }}
-                    and {{ snowflake__catalog_equals('table_name', relation.identifier) }}
-                )
-            {% elif relation.schema %}
-                (
-                    {{ snowflake__catalog_equals('table_schema', relation.schema) }}
-                )
-            {% else %}
-                {% do exceptions.raise_compiler_error(
-                    '`get_catalog_relations` requires a list of relations, each with a schema'
-                ) %}
-            {% endif %}
-
-            {%- if not loop.last %} or {% endif -%}
-        {%- endfor -%}
+        {%- if schemas %}
+        {{ snowflake__catalog_in_sql(['table_schema'], schemas) }}
+        {%- endif -%}
+        {%- if schemas and tables %} or{% endif -%}
+        {%- if tables %}
+        {{ snowflake__catalog_in_sql(['table_schema', 'table_name'], tables) }}
+        {%- endif %}
     )
 {%- endmacro %}
@@ -1,6 +1,20 @@
+{% macro get_bulk_load_min_rows() -%}
+  {{ return(adapter.dispatch('get_bulk_load_min_rows', 'dbt')()) }}
+{%- endmacro %}
+
+{% macro snowflake__get_bulk_load_min_rows() %}
+  {{ return(10000) }}
+{% endmacro %}
+
 {% macro snowflake__load_csv_rows(model, agate_table) %}
-    {% set batch_size = get_batch_size() %}
     {% set cols_sql = get_seed_column_quoted_csv(model, agate_table.column_names) %}
+
+    {# smaller seeds load faster as inserts than with the extra round trips of put + copy #}
+    {% if config.get('bulk_load', false) and agate_table.rows | length >= get_bulk_load_min_rows() %}
+        {{ return(adapter.bulk_load_seed(this, agate_table, cols_sql)) }}
+    {% endif %}
+
+    {% set batch_size = get_batch_size() %}
     {% set bindings = [] %}
 
     {% set statements = [] %}
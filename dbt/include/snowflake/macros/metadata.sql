@@ -6,14 +6,48 @@
                last_altered as last_modified,
                {{ current_timestamp() }} as snapshotted_at
         from {{ information_schema }}.tables
-        where (
-          {%- for relation in relations -%}
-            (upper(table_schema) = upper('{{ relation.schema }}') and
-             upper(table_name) = upper('{{ relation.identifier }}')){%- if not loop.last %} or {% endif -%}
-          {%- endfor -%}
-        )
+        {{ snowflake__get_catalog_relations_where_clause_sql(relations) }}
   {%- endcall -%}
 
   {{ return(load_result('last_modified')) }}
 
 {% endmacro %}
+
+
+{% macro snowflake__get_relations_changed_since(schema_relation, watermark=none) -%}
+
+  {%- call statement('relations_changed_since', fetch_result=True) -%}
+        with objects as (
+            {#- the kinds `show objects` reports, so a delta gives relations the same types -#}
+            select table_catalog as database_name,
+                   table_schema as schema_name,
+                   table_name as name,
+                   case
+                       when table_type in ('BASE TABLE', 'TEMPORARY TABLE') then 'TABLE'
+                       else replace(table_type, ' ', '_')
+                   end as kind,
+                   iff(is_dynamic = 'YES', 'Y', 'N') as is_dynamic,
+                   last_altered
+            from {{ schema_relation.information_schema() }}.tables
+            where table_schema = {{ snowflake__catalog_identifier(schema_relation.schema, schema_relation.quote_policy.schema) }}
+        ),
+        hashed_objects as (
+            select *, hash(name, kind, is_dynamic) as name_hash
+            from objects
+        )
+        {#- xor rather than hash_agg, so it can be checked against the cached hashes -#}
+        select database_name, schema_name, name, kind, is_dynamic, name_hash,
+               null as object_count, null as fingerprint, null as watermark
+        from hashed_objects
+        {% if watermark -%}
+        where last_altered >= '{{ watermark }}'::timestamp_ltz
+        {%- endif %}
+        union all
+        select null, null, null, null, null, null,
+               count(*), coalesce(bitxor_agg(name_hash), 0), max(last_altered)
+        from hashed_objects
+  {%- endcall -%}
+
+  {{ return(load_result('relations_changed_since').table) }}
+
+{% endmacro %}
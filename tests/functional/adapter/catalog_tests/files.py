@@ -30,3 +30,15 @@ MY_DYNAMIC_TABLE = """
 ) }}
 select * from {{ ref('my_seed') }}
 """
+
+
+QUOTED_IDENTIFIER_SOURCES = """
+sources:
+  - name: my_source
+    schema: "{{ target.schema }}"
+    quoting:
+      identifier: true
+    tables:
+      - name: Mixed_Case
+      - name: MIXED_CASE
+"""
@@ -42,3 +42,28 @@ class TestCatalogRelationTypes:
         assert node_name in docs.nodes
         node = docs.nodes[node_name]
         assert node.metadata.type == relation_type
+
+
+class TestCatalogQuotedIdentifierSource:
+    @pytest.fixture(scope="class", autouse=True)
+    def models(self):
+        return {"sources.yml": files.QUOTED_IDENTIFIER_SOURCES}
+
+    @pytest.fixture(scope="class", autouse=True)
+    def docs(self, project):
+        project.run_sql(f'create table {project.test_schema}."Mixed_Case" (id integer)')
+        project.run_sql(f"create table {project.test_schema}.mixed_case (name varchar)")
+        yield run_dbt(["docs", "generate"])
+
+    @pytest.mark.parametrize(
+        "source_name,column_name",
+        [
+            ("source.test.my_source.Mixed_Case", "ID"),
+            ("source.test.my_source.MIXED_CASE", "NAME"),
+        ],
+    )
+    def test_quoted_identifier_sources_populate_correctly(
+        self, docs: CatalogArtifact, source_name: str, column_name: str
+    ):
+        assert source_name in docs.sources
+        assert list(docs.sources[source_name].columns) == [column_name]
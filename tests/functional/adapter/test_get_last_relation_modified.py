@@ -32,6 +32,20 @@ sources:
         loaded_at_field: my_loaded_at_field
 """
 
+freshness_quoted_identifier_schema_yml = """
+sources:
+  - name: test_source
+    freshness:
+      warn_after: {count: 10, period: hour}
+      error_after: {count: 1, period: day}
+    schema: "{{ env_var('DBT_GET_LAST_RELATION_TEST_SCHEMA') }}"
+    quoting:
+      identifier: true
+    tables:
+      - name: Mixed_Case
+      - name: MIXED_CASE
+"""
+
 
 class SetupGetLastRelationModified:
     @pytest.fixture(scope="class", autouse=True)
@@ -150,3 +164,22 @@ class TestGetLastRelationModifiedBatch(SetupGetLastRelationModified):
             test_table_with_loaded_at_field_batch_result.max_loaded_at
             == test_table_with_loaded_at_field_result.max_loaded_at
         )
+
+
+class TestGetLastRelationModifiedQuotedIdentifier(SetupGetLastRelationModified):
+    @pytest.fixture(scope="class")
+    def models(self):
+        return {"schema.yml": freshness_quoted_identifier_schema_yml}
+
+    def test_get_last_relation_modified_quoted_identifier(
+        self, project, set_env_vars, custom_schema
+    ):
+        # tables whose names only differ by case are told apart
+        project.run_sql(f'create table {custom_schema}."Mixed_Case" (id integer);')
+        project.run_sql(f"create table {custom_schema}.mixed_case (id integer);")
+
+        results = dbtRunner().invoke(["source", "freshness"]).result
+
+        assert len(results) == 2
+        assert all(result.status == "pass" for result in results)
+        assert all(result.max_loaded_at is not None for result in results)
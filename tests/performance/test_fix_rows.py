@@ -0,0 +1,89 @@
+"""
+Results:
+
+| implementation      | rows   | columns | timezone aware columns | duration |
+|---------------------|--------|---------|------------------------|----------|
+| per cell (original) | 50,000 | 20      | 0                      |    0.10s |
+| by column type      | 50,000 | 20      | 0                      |    0.00s |
+| per cell (original) | 50,000 | 20      | 2                      |    0.39s |
+| by column type      | 50,000 | 20      | 2                      |    0.16s |
+| per cell (original) | 50,000 | 20      | 20                     |    2.76s |
+| by column type      | 50,000 | 20      | 20                     |    1.58s |
+
+Notes:
+- run locally on Linux with Python 3.11, single threaded
+- 1,000,000 cells per run; the other columns are a mix of numbers and strings
+- this test does not connect to Snowflake, rows are generated in memory
+- when no column holds timezone aware values, rows are passed through untouched
+"""
+
+import datetime
+from time import perf_counter
+
+import pytest
+import pytz
+
+from dbt.adapters.snowflake.connections import SnowflakeConnectionManager
+
+
+ROWS = 50_000
+COLUMNS = 20
+
+
+def _description(timezone_aware_columns: int):
+    # FIXED, TEXT and TIMESTAMP_TZ type codes from `snowflake.connector.constants`
+    other_columns = COLUMNS - timezone_aware_columns
+    return (
+        [(f"number_{i}", 0) for i in range(other_columns // 2)]
+        + [(f"text_{i}", 2) for i in range(other_columns - other_columns // 2)]
+        + [(f"loaded_at_{i}", 7) for i in range(timezone_aware_columns)]
+    )
+
+
+def _original_fix_rows(rows):
+    # the implementation of `SnowflakeConnectionManager._fix_rows` before columns were
+    # filtered by type, kept here as the baseline
+    for row in rows:
+        fixed_row = []
+        for col in row:
+            if isinstance(col, datetime.datetime) and col.tzinfo:
+                offset = col.utcoffset()
+                assert offset is not None
+                offset_seconds = offset.total_seconds()
+                new_timezone = pytz.FixedOffset(int(offset_seconds // 60))
+                col = col.astimezone(tz=new_timezone)
+            fixed_row.append(col)
+
+        yield fixed_row
+
+
+def _rows(description):
+    timezone = datetime.timezone(datetime.timedelta(hours=-7))
+    values = {
+        0: 42,
+        2: "value",
+        7: datetime.datetime(2024, 1, 1, 12, tzinfo=timezone),
+    }
+    row = tuple(values[type_code] for _, type_code in description)
+    return [row] * ROWS
+
+
+def _duration(rows) -> float:
+    start = perf_counter()
+    for _ in rows:
+        pass
+    return perf_counter() - start
+
+
+@pytest.mark.parametrize("timezone_aware_columns", [0, 2, 20])
+def test_fix_rows(timezone_aware_columns):
+    description = _description(timezone_aware_columns)
+    rows = _rows(description)
+
+    original = _duration(_original_fix_rows(rows))
+    columns = SnowflakeConnectionManager._timezone_aware_columns(description)
+    by_column_type = _duration(SnowflakeConnectionManager._fix_rows(rows, columns))
+
+    print(f"per cell (original): {original:.2f}s")
+    print(f"by column type: {by_column_type:.2f}s")
+    assert by_column_type < original
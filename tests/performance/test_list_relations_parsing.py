@@ -0,0 +1,102 @@
+"""
+Results:
+
+| implementation       | objects | duration |
+|----------------------|---------|----------|
+| per row (original)   | 100,000 |    1.95s |
+| bulk                 | 100,000 |    0.66s |
+
+Notes:
+- run locally on Linux with Python 3.11, single threaded
+- this test does not connect to Snowflake, the `show objects` output is generated in memory
+- a tenth of the objects are views and a tenth of the tables are dynamic tables
+"""
+
+from time import perf_counter
+from types import SimpleNamespace
+
+from dbt_common.clients import agate_helper
+
+from dbt.adapters.snowflake import SnowflakeAdapter, SnowflakeRelation
+
+
+OBJECTS = 100_000
+
+
+def _show_objects():
+    column_names = (
+        "created_on",
+        "name",
+        "database_name",
+        "schema_name",
+        "kind",
+        "comment",
+        "is_dynamic",
+    )
+    rows = [
+        (
+            "2024-01-01 00:00:00",
+            f"OBJECT_{i}",
+            "MY_DATABASE",
+            f"SCHEMA_{i % 10}",
+            "VIEW" if i % 10 == 0 else "TABLE",
+            "",
+            "Y" if i % 10 == 1 else "N",
+        )
+        for i in range(OBJECTS)
+    ]
+    return agate_helper.table_from_rows(rows, column_names)
+
+
+def _original_parse(results):
+    # the implementation of `SnowflakeAdapter._parse_list_relations_results` before rows were
+    # parsed in bulk, kept here as the baseline
+    columns = ["database_name", "schema_name", "name", "kind"]
+    if "is_dynamic" in results.column_names:
+        columns.append("is_dynamic")
+
+    relations = []
+    for result in results.select(columns):
+        try:
+            database, schema, identifier, relation_type, is_dynamic = result
+        except ValueError:
+            database, schema, identifier, relation_type = result
+            is_dynamic = "N"
+
+        try:
+            relation_type = SnowflakeRelation.get_relation_type(relation_type.lower())
+        except ValueError:
+            relation_type = SnowflakeRelation.External
+
+        if relation_type == SnowflakeRelation.Table and is_dynamic == "Y":
+            relation_type = SnowflakeRelation.DynamicTable
+
+        quote_policy = {"database": True, "schema": True, "identifier": True}
+        relations.append(
+            SnowflakeRelation.create(
+                database=database,
+                schema=schema,
+                identifier=identifier,
+                type=relation_type,
+                quote_policy=quote_policy,
+            )
+        )
+    return relations
+
+
+def test_parse_list_relations_results():
+    results = _show_objects()
+    adapter = SimpleNamespace(Relation=SnowflakeRelation)
+
+    start = perf_counter()
+    original = _original_parse(results)
+    original_duration = perf_counter() - start
+
+    start = perf_counter()
+    bulk = SnowflakeAdapter._parse_list_relations_results(adapter, results)
+    bulk_duration = perf_counter() - start
+
+    print(f"per row (original): {original_duration:.2f}s")
+    print(f"bulk: {bulk_duration:.2f}s")
+    assert [(r.render(), r.type) for r in bulk] == [(r.render(), r.type) for r in original]
+    assert bulk_duration < original_duration
@@ -0,0 +1,89 @@
+"""
+Compares loading a large seed with batched inserts (the default) against `bulk_load`,
+which uploads the seed to the table's stage and copies it in with a single statement.
+
+Results:
+
+Not run yet, these scenarios need a Snowflake account. Record the duration of `dbt seed`
+for each scenario in a table with these columns:
+
+| method          | rows    | duration |
+|-----------------|---------|----------|
+
+Notes:
+- `bulk_load` only applies to seeds with at least `get_bulk_load_min_rows()` rows, smaller
+  seeds use batched inserts either way
+- the seed has five columns: an integer, a decimal, a date, a timestamp and a short string
+"""
+
+from datetime import datetime
+import os
+
+from dbt.tests.util import run_dbt
+import pytest
+
+
+def _seed(rows: int) -> str:
+    lines = ["id,amount,created_on,updated_at,name"]
+    lines.extend(
+        f"{i},{i % 1000}.25,2024-01-{i % 28 + 1:02},2024-01-01 12:{i % 60:02}:00,name_{i}"
+        for i in range(rows)
+    )
+    return "\n".join(lines)
+
+
+class Scenario:
+    """
+    Runs `dbt seed` on a single seed. Configure the test by setting `rows` and `bulk_load`.
+    """
+
+    rows: int
+    bulk_load: bool = False
+
+    @pytest.fixture(scope="class")
+    def seeds(self):
+        return {"my_seed.csv": _seed(self.rows)}
+
+    @pytest.fixture(scope="class")
+    def project_config_update(self):
+        return {"seeds": {"bulk_load": self.bulk_load}}
+
+    @pytest.fixture(scope="class")
+    def dbt_profile_target(self):
+        yield {
+            "type": "snowflake",
+            "threads": 4,
+            "account": os.getenv("SNOWFLAKE_TEST_ACCOUNT"),
+            "database": os.getenv("SNOWFLAKE_TEST_DATABASE"),
+            "warehouse": os.getenv("SNOWFLAKE_TEST_WAREHOUSE"),
+            "user": os.getenv("SNOWFLAKE_TEST_USER"),
+            "password": os.getenv("SNOWFLAKE_TEST_PASSWORD"),
+        }
+
+    def test_scenario(self, project):
+        start = datetime.now()
+        run_dbt(["seed"])
+        end = datetime.now()
+
+        duration = (end - start).total_seconds()
+        print(f"Seed took: {duration} seconds")
+
+
+class TestInsert100k(Scenario):
+    rows = 100_000
+    bulk_load = False
+
+
+class TestBulkLoad100k(Scenario):
+    rows = 100_000
+    bulk_load = True
+
+
+class TestInsert1m(Scenario):
+    rows = 1_000_000
+    bulk_load = False
+
+
+class TestBulkLoad1m(Scenario):
+    rows = 1_000_000
+    bulk_load = True
@@ -0,0 +1,110 @@
+import os
+import re
+
+import jinja2
+import pytest
+
+from dbt.adapters.snowflake.relation import SnowflakeRelation
+
+
+MACROS_DIR = os.path.join(
+    os.path.dirname(__file__), os.pardir, os.pardir, "dbt", "include", "snowflake", "macros"
+)
+
+
+@pytest.fixture(scope="module")
+def macros():
+    sources = []
+    for path in ("catalog.sql", os.path.join("utils", "escape_single_quotes.sql")):
+        with open(os.path.join(MACROS_DIR, path)) as f:
+            sources.append(f.read())
+    env = jinja2.Environment(extensions=["jinja2.ext.do"])
+    return env.from_string("\n".join(sources)).make_module({"exceptions": None})
+
+
+def _sql(rendered) -> str:
+    return re.sub(r"\s+", " ", str(rendered)).strip()
+
+
+def _relation(schema, identifier=None, quoted=False):
+    return SnowflakeRelation.create(
+        database="test_database",
+        schema=schema,
+        identifier=identifier,
+        quote_policy={"schema": quoted, "identifier": quoted},
+    )
+
+
+def test_relations_where_clause_normalizes_names_by_quote_policy(macros):
+    relations = [
+        _relation("My_Schema", "My_Table"),
+        _relation("My_Schema", "My_Table", quoted=True),
+        _relation("Other_Schema"),
+    ]
+
+    sql = _sql(macros.snowflake__get_catalog_relations_where_clause_sql(relations))
+
+    assert sql == (
+        "where ( ( table_schema in ('OTHER_SCHEMA') ) or "
+        "( (table_schema, table_name) in "
+        "(('MY_SCHEMA', 'MY_TABLE'), ('My_Schema', 'My_Table')) ) )"
+    )
+
+
+def test_relations_where_clause_deduplicates(macros):
+    relations = [
+        _relation("my_schema", "my_table"),
+        _relation("MY_SCHEMA", "MY_TABLE"),
+        _relation("other_schema"),
+        _relation("OTHER_SCHEMA"),
+    ]
+
+    sql = _sql(macros.snowflake__get_catalog_relations_where_clause_sql(relations))
+
+    assert sql.count("'MY_TABLE'") == 1
+    assert sql.count("'OTHER_SCHEMA'") == 1
+
+
+def test_relations_where_clause_escapes_quotes(macros):
+    relations = [_relation("my_schema", "it's", quoted=True), _relation("my_schema", "a\\b")]
+
+    sql = _sql(macros.snowflake__get_catalog_relations_where_clause_sql(relations))
+
+    assert "('my_schema', 'it\\'s')" in sql
+    assert "('MY_SCHEMA', 'A\\\\B')" in sql
+
+
+def test_in_sql_splits_long_lists(macros):
+    values = [f"'T{i}'" for i in range(2001)]
+
+    sql = _sql(macros.snowflake__catalog_in_sql(["table_name"], values))
+
+    lists = re.findall(r"table_name in \(([^)]*)\)", sql)
+    assert [len(values.split(", ")) for values in lists] == [1000, 1000, 1]
+    assert sql.count(" or ") == 2
+
+
+def test_schemas_where_clause(macros):
+    information_schema = _relation("my_schema").information_schema()
+
+    sql = _sql(
+        macros.snowflake__get_catalog_schemas_where_clause_sql(
+            ["my_schema", "My_Schema", "other"], information_schema
+        )
+    )
+
+    assert sql == "where ( table_schema in ('MY_SCHEMA', 'OTHER') )"
+
+
+def test_schemas_where_clause_with_quoted_schemas(macros):
+    # dbt passes schema names lower cased, so quoted schemas are matched case insensitively
+    information_schema = _relation("My_Schema", quoted=True).information_schema()
+
+    sql = _sql(
+        macros.snowflake__get_catalog_schemas_where_clause_sql(["my_schema"], information_schema)
+    )
+
+    assert sql == (
+        "where (( \"table_schema\" ilike 'my_schema' and "
+        "upper(\"table_schema\") = upper('my_schema') ))"
+    )
@@ -1,9 +1,14 @@
+import datetime
+import decimal
 import os
 import pytest
+import threading
 from importlib import reload
 from unittest.mock import Mock, patch
 import multiprocessing
+from snowflake.connector.errors import NotSupportedError, ProgrammingError
 from dbt.adapters.exceptions.connection import FailedToConnectError
+import dbt.adapters.snowflake.connection_pool as connection_pool
 import dbt.adapters.snowflake.connections as connections
 import dbt.adapters.events.logging
 
@@ -67,3 +72,332 @@ def test_snowflake_oauth_expired_token_raises_error():
 
         with pytest.raises(FailedToConnectError):
             adapter.open()
+
+
+def test_arrow_result_fetching_respects_limit_and_timezones():
+    pa = pytest.importorskip("pyarrow")
+    tz_value = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+    batch = pa.table(
+        {
+            "ID": pa.array([1, 2, 3]),
+            "LOADED_AT": pa.array([tz_value] * 3, type=pa.timestamp("us", tz="+05:30")),
+        }
+    )
+    cursor = Mock()
+    # FIXED and TIMESTAMP_LTZ
+    cursor.description = [("ID", 0, None, None, 38, 0), ("LOADED_AT", 6, None, None, 0, 9)]
+    cursor.fetch_arrow_batches.return_value = iter([batch, batch])
+
+    table = connections.SnowflakeConnectionManager.get_arrow_result_from_cursor(cursor, limit=4)
+
+    assert table.column_names == ("ID", "LOADED_AT")
+    assert len(table.rows) == 4
+    assert table.rows[0]["LOADED_AT"] == tz_value
+    assert table.rows[0]["LOADED_AT"].utcoffset() == datetime.timedelta(hours=5, minutes=30)
+    cursor.fetchall.assert_not_called()
+
+
+def test_arrow_result_fetching_falls_back_to_rows():
+    cursor = Mock()
+    cursor.description = [("name",)]
+    cursor.fetch_arrow_batches.side_effect = NotSupportedError
+    cursor.fetchall.return_value = [("a",), ("b",)]
+
+    table = connections.SnowflakeConnectionManager.get_arrow_result_from_cursor(cursor, limit=None)
+
+    assert [row["name"] for row in table] == ["a", "b"]
+
+
+def test_arrow_result_fetching_matches_rows():
+    pa = pytest.importorskip("pyarrow")
+    amount = pa.array([decimal.Decimal("1.25")], type=pa.decimal128(38, 2))
+    loaded_at = pa.array([1_704_110_400_123_456_789], type=pa.timestamp("ns"))
+    cursor = Mock()
+    # NUMBER(38, 2) and TIMESTAMP_NTZ(9)
+    cursor.description = [("AMOUNT", 0, None, None, 38, 2), ("LOADED_AT", 8, None, None, 0, 9)]
+    cursor.fetch_arrow_batches.return_value = iter(
+        [pa.table({"AMOUNT": amount, "LOADED_AT": loaded_at})]
+    )
+    cursor.connection.arrow_number_to_decimal = True
+
+    table = connections.SnowflakeConnectionManager.get_arrow_result_from_cursor(cursor, limit=None)
+
+    assert table.rows[0]["AMOUNT"] == decimal.Decimal("1.25")
+    # truncated to microseconds, like the connector does for rows
+    assert table.rows[0]["LOADED_AT"] == datetime.datetime(2024, 1, 1, 12, 0, 0, 123456)
+    cursor.fetchall.assert_not_called()
+
+
+@pytest.mark.parametrize(
+    "column,arrow_number_to_decimal",
+    [
+        # TIMESTAMP_TZ keeps the offset of each row only in rows
+        (("LOADED_AT", 7, None, None, 0, 9), True),
+        # NUMBER(38, 2) is a float in Arrow batches, unless the connection converts to decimal
+        (("AMOUNT", 0, None, None, 38, 2), False),
+        # unknown column types
+        (("AMOUNT",), True),
+    ],
+)
+def test_arrow_result_fetching_falls_back_to_rows_for_column_types(
+    column, arrow_number_to_decimal
+):
+    cursor = Mock()
+    cursor.description = [column]
+    cursor.connection.arrow_number_to_decimal = arrow_number_to_decimal
+    cursor.fetchall.return_value = [("a",)]
+
+    table = connections.SnowflakeConnectionManager.get_arrow_result_from_cursor(cursor, limit=None)
+
+    assert [row[0] for row in table] == ["a"]
+    cursor.fetch_arrow_batches.assert_not_called()
+
+
+def test_fix_rows_only_converts_timezone_aware_columns():
+    description = [("ID", 0), ("NAME", 2), ("LOADED_AT", 7)]
+    tz_value = datetime.datetime(
+        2024, 1, 1, 12, tzinfo=datetime.timezone(datetime.timedelta(hours=-7))
+    )
+    columns = connections.SnowflakeConnectionManager._timezone_aware_columns(description)
+
+    assert columns == [2]
+
+    rows = list(connections.SnowflakeConnectionManager._fix_rows([(1, "a", tz_value)], columns))
+
+    assert rows == [[1, "a", tz_value]]
+    assert rows[0][2].tzinfo is connections._fixed_offset(-420)
+
+
+def test_fix_rows_checks_every_column_without_type_codes():
+    description = [("ID",), ("LOADED_AT",)]
+    tz_value = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+    columns = connections.SnowflakeConnectionManager._timezone_aware_columns(description)
+    rows = list(connections.SnowflakeConnectionManager._fix_rows([(1, tz_value)], columns))
+
+    assert columns is None
+    assert rows[0][1].tzinfo is connections._fixed_offset(0)
+
+
+def test_split_statements_classifies_and_drops_empty_statements():
+    sql = "begin;\n-- a comment\ninsert into t values (1);\n/* done */ commit;\n-- trailing"
+
+    statements = connections.split_statements(sql)
+
+    assert [(s.sql, s.kind) for s in statements] == [
+        ("begin;", connections.StatementKind.Begin),
+        ("-- a comment\ninsert into t values (1);", connections.StatementKind.Query),
+        ("/* done */ commit;", connections.StatementKind.Query),
+    ]
+    assert connections.split_statements(sql) is statements
+
+
+def test_split_statements_does_not_cache_large_sql(monkeypatch):
+    monkeypatch.setattr(connections, "_SPLIT_CACHE_MAX_SQL_LENGTH", 10)
+    sql = "select 1 as id;"
+
+    assert connections.split_statements(sql) == connections.split_statements(sql)
+    assert connections.split_statements(sql) is not connections.split_statements(sql)
+
+
+@pytest.mark.parametrize(
+    "sql,expected",
+    [
+        ("use warehouse my_wh;", [("warehouse", "MY_WH")]),
+        ('/* dbt */ use role "My Role"', [("role", "My Role")]),
+        ("use schema my_db.my_schema", [("database", "MY_DB"), ("schema", "MY_SCHEMA")]),
+        ("use database my_db", [("database", "MY_DB"), ("schema", None)]),
+        ("use my_db", [("database", None), ("schema", None)]),
+        ("alter session set query_tag = 'it''s'", [("query_tag", "it's")]),
+        ("alter session unset query_tag", [("query_tag", "")]),
+        ("alter session set query_tag = 'a', timezone = 'UTC'", [("query_tag", None)]),
+        ("alter table my_table add column query_tag varchar", []),
+        ("select user_id from my_table", []),
+    ],
+)
+def test_split_statements_detects_session_changes(sql, expected):
+    (statement,) = connections.split_statements(sql)
+    assert list(statement.session_changes) == expected
+
+
+@pytest.mark.parametrize(
+    "sql,expected",
+    [
+        ("create or replace transient table my_db.my_schema.my_table as (select 1)", {"MY_TABLE"}),
+        ('/* dbt */ create or replace view "My Schema"."My View" as select 1', {"My View"}),
+        ("alter table my_table__dbt_tmp rename to my_table", {"MY_TABLE__DBT_TMP", "MY_TABLE"}),
+        ("alter table my_table swap with my_other_table", {"MY_TABLE", "MY_OTHER_TABLE"}),
+        ("drop table if exists my_db.my_schema.my_table cascade", {"MY_TABLE"}),
+        ("create or replace dynamic table my_table target_lag = '1 hour'", {"MY_TABLE"}),
+        ("create or replace table identifier($name) as select 1", None),
+        ("drop schema my_schema", None),
+        ("call my_procedure()", None),
+        ("with my_procedure as procedure () returns int call my_procedure()", None),
+        ("begin transaction", set()),
+        ("create or replace stage my_stage", set()),
+        ("insert into my_table select 1", set()),
+        ("select * from my_table", set()),
+    ],
+)
+def test_split_statements_detects_altered_relations(sql, expected):
+    (statement,) = connections.split_statements(sql)
+    assert statement.altered_relations == (None if expected is None else frozenset(expected))
+
+
+def test_connection_pool_reuses_sessions_of_the_same_key():
+    pool = connection_pool.SnowflakeConnectionPool()
+    handle = Mock()
+
+    assert pool.checkout("a") is None
+    pool.checkin("a", handle, idle_timeout=600)
+    assert pool.checkout("b") is None
+    assert pool.checkout("a") is handle
+    assert pool.checkout("a") is None
+    assert (pool.stats.hits, pool.stats.misses) == (1, 3)
+
+
+def test_connection_pool_evicts_idle_and_invalid_sessions(monkeypatch):
+    pool = connection_pool.SnowflakeConnectionPool()
+    expired, invalid = Mock(), Mock()
+    invalid.is_valid.return_value = False
+
+    pool.checkin("a", expired, idle_timeout=0)
+    expired.close.assert_called_once()
+
+    monkeypatch.setattr(connection_pool, "HEARTBEAT_AFTER_IDLE_SECONDS", 0)
+    pool.checkin("a", invalid, idle_timeout=600)
+    assert pool.checkout("a") is None
+    invalid.close.assert_called_once()
+    assert pool.stats.evictions == 2
+
+
+def test_connection_pool_sends_heartbeat_without_is_valid(monkeypatch):
+    monkeypatch.setattr(connection_pool, "HEARTBEAT_AFTER_IDLE_SECONDS", 0)
+    pool = connection_pool.SnowflakeConnectionPool()
+    # connectors before is_valid() was added
+    alive = Mock(spec=["cursor", "is_closed", "close"])
+    expired = Mock(spec=["cursor", "is_closed", "close"])
+    for handle in (alive, expired):
+        handle.is_closed.return_value = False
+    expired.cursor.return_value.execute.side_effect = ProgrammingError("Session no longer exists")
+
+    pool.checkin("a", alive, idle_timeout=600)
+    pool.checkin("b", expired, idle_timeout=600)
+
+    assert pool.checkout("a") is alive
+    alive.cursor.return_value.execute.assert_called_once_with("select 1")
+    assert pool.checkout("b") is None
+    expired.close.assert_called_once()
+
+
+def test_connection_pool_prewarm_opens_sessions_in_the_background():
+    pool = connection_pool.SnowflakeConnectionPool()
+    opened = threading.Event()
+    handles = [Mock(), Mock()]
+
+    def open_handle():
+        opened.wait()
+        if not handles:
+            raise FailedToConnectError("no more sessions")
+        return handles.pop()
+
+    pool.prewarm("a", open_handle, count=3, idle_timeout=600)
+    # checkouts wait for the sessions being opened instead of opening their own
+    checked_out = []
+    checkout = threading.Thread(target=lambda: checked_out.append(pool.checkout("a")))
+    checkout.start()
+    opened.set()
+    checkout.join(timeout=5)
+
+    assert checked_out[0] is not None
+    assert pool.checkout("a") is not None
+    assert pool.checkout("a") is None
+    assert (pool.stats.prewarmed, pool.stats.hits, pool.stats.misses) == (2, 2, 1)
+
+
+def test_connection_pool_checkout_stops_waiting_for_hung_prewarms():
+    pool = connection_pool.SnowflakeConnectionPool()
+    opened = threading.Event()
+    handle = Mock()
+
+    def open_handle():
+        opened.wait()
+        return handle
+
+    pool.prewarm("a", open_handle, count=1, idle_timeout=600)
+    # the caller opens its own session instead of waiting for the login to finish
+    assert pool.checkout("a", timeout=0.01) is None
+
+    opened.set()
+    assert pool.checkout("a", timeout=5) is handle
+    assert (pool.stats.prewarmed, pool.stats.hits, pool.stats.misses) == (1, 1, 1)
+
+
+def test_oauth_access_token_is_shared_until_it_expires(monkeypatch):
+    monkeypatch.setattr(connections, "_access_tokens", connections._AccessTokenCache())
+    now = [1000.0]
+    monkeypatch.setattr(connections, "monotonic", lambda: now[0])
+    responses = iter(["first", "second"])
+
+    def post(*args, **kwargs):
+        return Mock(json=Mock(return_value={"access_token": next(responses), "expires_in": 600}))
+
+    credentials = connections.SnowflakeCredentials(
+        account="test_account",
+        user="test_user",
+        authenticator="oauth",
+        token="refresh_token",
+        oauth_client_id="client_id",
+        oauth_client_secret="client_secret",
+        database="database",
+        schema="schema",
+    )
+    with patch.object(connections.requests, "post", side_effect=post) as mock_post:
+        threads = [
+            threading.Thread(target=lambda: credentials.auth_args()["token"]) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        assert credentials.auth_args()["token"] == "first"
+        assert mock_post.call_count == 1
+
+        # refreshed shortly before it expires
+        now[0] += 600 - connections.ACCESS_TOKEN_REFRESH_MARGIN
+        assert credentials.auth_args()["token"] == "second"
+        assert mock_post.call_count == 2
+
+
+def test_connect_args_are_computed_once():
+    credentials = connections.SnowflakeCredentials(
+        account="test_account",
+        user="test_user",
+        password="password",
+        database="database",
+        schema="schema",
+        query_tag="tag",
+    )
+    with patch.object(
+        credentials, "_static_auth_args", wraps=credentials._static_auth_args
+    ) as static_auth_args:
+        first = credentials.connect_args.connect_kwargs(credentials)
+        second = credentials.connect_args.connect_kwargs(credentials)
+
+    assert static_auth_args.call_count == 1
+    assert first == second
+    assert first["password"] == "password"
+    assert first["session_parameters"] == {"QUERY_TAG": "tag"}
+    assert first["session_parameters"] is not second["session_parameters"]
+    assert first["private_key"] is None
+
+
+def test_arrow_result_fetching_connects_with_decimals():
+    credentials = connections.SnowflakeCredentials(
+        account="test_account",
+        user="test_user",
+        database="database",
+        schema="schema",
+        arrow_result_fetching=True,
+    )
+    assert credentials.connect_args.connect_kwargs(credentials)["arrow_number_to_decimal"]
@@ -6,7 +6,11 @@ from cryptography.hazmat.primitives import serialization
 from cryptography.hazmat.primitives.asymmetric import rsa
 import pytest
 
-from dbt.adapters.snowflake.auth import private_key_from_file, private_key_from_string
+from dbt.adapters.snowflake.auth import (
+    PrivateKeyCache,
+    private_key_from_file,
+    private_key_from_string,
+)
 
 
 PASSPHRASE = "password1234"
@@ -59,3 +63,43 @@ def test_private_key_from_file(private_key_file, private_key):
     assert os.path.exists(private_key_file)
     calculated_private_key = private_key_from_file(private_key_file, PASSPHRASE)
     assert serialize(calculated_private_key) == serialize(private_key)
+
+
+def test_private_key_cache_from_string(private_key_string, private_key):
+    cache = PrivateKeyCache()
+    assert cache.from_string(private_key_string, PASSPHRASE) == serialize(private_key)
+    assert cache.from_string(private_key_string, PASSPHRASE) == serialize(private_key)
+    assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+
+def test_private_key_cache_reloads_rotated_key_files(private_key):
+    rotated_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    cache = PrivateKeyCache()
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "rsa_key.p8")
+        for mtime, key in ((1, private_key), (2, rotated_key)):
+            with open(path, "wb") as file:
+                file.write(
+                    key.private_bytes(
+                        encoding=serialization.Encoding.PEM,
+                        format=serialization.PrivateFormat.PKCS8,
+                        encryption_algorithm=serialization.NoEncryption(),
+                    )
+                )
+            os.utime(path, (mtime, mtime))
+            assert cache.from_file(path) == serialize(key)
+            assert cache.from_file(path) == serialize(key)
+    assert (cache.stats.hits, cache.stats.misses) == (2, 2)
+
+
+def test_private_key_cache_is_bounded(private_key_string, private_key_file):
+    cache = PrivateKeyCache(maxsize=1)
+    cache.from_string(private_key_string, PASSPHRASE)
+    cache.from_file(private_key_file, PASSPHRASE)
+    cache.from_string(private_key_string, PASSPHRASE)
+    assert cache.stats.misses == 3
+
+    cache = PrivateKeyCache(ttl=0)
+    cache.from_string(private_key_string, PASSPHRASE)
+    cache.from_string(private_key_string, PASSPHRASE)
+    assert cache.stats.misses == 2
@@ -1,6 +1,10 @@
 import agate
+import datetime
+import os
 import re
+import tempfile
 import unittest
+import zlib
 from multiprocessing import get_context
 from contextlib import contextmanager
 from unittest import mock
@@ -8,12 +12,16 @@ from unittest import mock
 from dbt.adapters.snowflake import SnowflakeAdapter
 from dbt.adapters.snowflake import Plugin as SnowflakePlugin
 from dbt.adapters.snowflake.column import SnowflakeColumn
+from dbt.adapters.snowflake.connection_pool import SnowflakeConnectionPool
 from dbt.adapters.snowflake.connections import SnowflakeCredentials
 from dbt.contracts.files import FileHash
 from dbt.context.query_header import generate_query_header_context
 from dbt.context.providers import generate_runtime_macro_context
 from dbt.contracts.graph.manifest import ManifestStateCheck
 from dbt_common.clients import agate_helper
+from dbt_common.context import set_invocation_context
+from dbt_common.exceptions import DbtDatabaseError, DbtRuntimeError
+from dbt_common.utils import executor
 from snowflake import connector as snowflake_connector
 
 from .utils import (
@@ -230,9 +238,42 @@ class TestSnowflakeAdapter(unittest.TestCase):
             ]
             self.mock_execute.assert_has_calls(calls)
             self.adapter.post_model_hook(config, result)
+            self.assertEqual(self.mock_execute.call_count, 2)
+            # switching back is deferred until the next statement
+            self.adapter.execute("select 1")
             calls.append(mock.call("/* dbt */\nuse warehouse warehouse", None))
+            calls.append(mock.call("/* dbt */\nselect 1", None))
             self.mock_execute.assert_has_calls(calls)
 
+    def test_pre_post_hooks_same_warehouse_elided(self):
+        with self.current_warehouse("WAREHOUSE"):
+            config = {"snowflake_warehouse": "other_warehouse"}
+            for _ in range(3):
+                result = self.adapter.pre_model_hook(config)
+                self.assertEqual(result, "WAREHOUSE")
+                self.adapter.execute("select 1")
+                self.adapter.post_model_hook(config, result)
+
+            self.mock_execute.assert_has_calls(
+                [
+                    mock.call("/* dbt */\nselect current_warehouse() as warehouse", None),
+                    mock.call("/* dbt */\nuse warehouse other_warehouse", None),
+                    mock.call("/* dbt */\nselect 1", None),
+                    mock.call("/* dbt */\nselect 1", None),
+                    mock.call("/* dbt */\nselect 1", None),
+                ]
+            )
+            self.assertEqual(self.mock_execute.call_count, 5)
+
+            self.adapter.pre_model_hook({})
+            self.adapter.execute("select 2")
+            self.mock_execute.assert_has_calls(
+                [
+                    mock.call("/* dbt */\nuse warehouse WAREHOUSE", None),
+                    mock.call("/* dbt */\nselect 2", None),
+                ]
+            )
+
     def test_pre_post_hooks_no_warehouse(self):
         with self.current_warehouse("warehouse"):
             config = {}
@@ -242,6 +283,855 @@ class TestSnowflakeAdapter(unittest.TestCase):
             self.adapter.post_model_hook(config, result)
             self.mock_execute.assert_not_called()
 
+    def test_query_tag_changed_once_for_consecutive_models(self):
+        self.cursor.description = [("key", 2), ("value", 2)]
+        self.cursor.fetchall.return_value = [("QUERY_TAG", "")]
+
+        for _ in range(3):
+            original_query_tag = self.adapter.set_query_tag("my_tag")
+            self.assertEqual(original_query_tag, "")
+            self.adapter.execute("select 1")
+            self.adapter.unset_query_tag(original_query_tag)
+
+        self.mock_execute.assert_has_calls(
+            [
+                mock.call("/* dbt */\nshow parameters like 'query_tag' in session", None),
+                mock.call("/* dbt */\nalter session set query_tag = 'my_tag'", None),
+                mock.call("/* dbt */\nselect 1", None),
+                mock.call("/* dbt */\nselect 1", None),
+                mock.call("/* dbt */\nselect 1", None),
+            ]
+        )
+        self.assertEqual(self.mock_execute.call_count, 5)
+
+        self.adapter.execute("select 2")
+        self.mock_execute.assert_has_calls(
+            [
+                mock.call("/* dbt */\nalter session unset query_tag", None),
+                mock.call("/* dbt */\nselect 2", None),
+            ]
+        )
+
+    def test_query_tag_from_credentials_is_not_looked_up(self):
+        self.config.credentials = self.config.credentials.replace(query_tag="my_tag")
+
+        self.assertEqual(self.adapter.set_query_tag("my_tag"), "my_tag")
+        self.adapter.execute("select 1")
+
+        self.mock_execute.assert_called_once_with("/* dbt */\nselect 1", None)
+
+    def test_bulk_load_seed(self):
+        table = agate_helper.table_from_rows([(1, "a"), (2, "b, c")], ("id", "name"))
+        relation = self.adapter.Relation.create(
+            database="test_database", schema="test_schema", identifier="my_seed"
+        )
+        uploaded = []
+
+        def execute(sql, bindings=None):
+            # the file only exists while the put statement runs
+            if "put 'file://" in sql:
+                with open(re.search(r"file://(\S+)'", sql).group(1)) as f:
+                    uploaded.extend(f.read().splitlines())
+
+        self.mock_execute.side_effect = execute
+
+        copy_sql = self.adapter.bulk_load_seed(relation, table, "id, name")
+
+        self.assertEqual(uploaded, ["id,name", "1,a", '2,"b, c"'])
+        put_sql, _ = self.mock_execute.call_args_list[0][0]
+        self.assertRegex(
+            put_sql,
+            r"put 'file://.*/seed.csv' @test_database.test_schema.%my_seed "
+            r"auto_compress = true overwrite = true$",
+        )
+        self.assertTrue(
+            copy_sql.startswith(
+                "copy into test_database.test_schema.my_seed (id, name) "
+                "from @test_database.test_schema.%my_seed"
+            )
+        )
+        self.mock_execute.assert_called_with(f"/* dbt */\n{copy_sql}", None)
+
+    def test_relations_cache_for_schemas_bounded_concurrency(self):
+        set_invocation_context({})
+        self.config.credentials = self.config.credentials.replace(max_metadata_queries=2)
+        schemas = {
+            self.adapter.Relation.create(database="test_database", schema=f"schema_{i}")
+            for i in range(5)
+        }
+
+        def list_relations(schema_relation):
+            return [
+                self.adapter.Relation.create(
+                    database=schema_relation.database,
+                    schema=schema_relation.schema,
+                    identifier="my_table",
+                    type="table",
+                )
+            ]
+
+        with mock.patch.object(
+            self.adapter, "list_relations_without_caching", side_effect=list_relations
+        ), mock.patch("dbt.adapters.snowflake.impl.executor", wraps=executor) as mock_executor:
+            self.adapter._relations_cache_for_schemas([], schemas)
+
+        self.assertEqual(mock_executor.call_args[0][0].threads, 2)
+        for i in range(5):
+            relations = self.adapter.cache.get_relations("test_database", f"schema_{i}")
+            self.assertEqual([relation.identifier for relation in relations], ["my_table"])
+
+    def test_list_relations_per_database(self):
+        set_invocation_context({})
+        self.config.credentials = self.config.credentials.replace(list_relations_per_database=True)
+        schemas = [
+            self.adapter.Relation.create(database="test_database", schema=schema)
+            for schema in ("schema_a", "schema_b")
+        ]
+        results = agate_helper.table_from_rows(
+            [
+                ("TEST_DATABASE", "SCHEMA_A", "TABLE_A", "TABLE"),
+                ("TEST_DATABASE", "SCHEMA_B", "VIEW_B", "VIEW"),
+                ("TEST_DATABASE", "SCHEMA_C", "TABLE_C", "TABLE"),
+            ],
+            ("database_name", "schema_name", "name", "kind"),
+        )
+
+        with mock.patch.object(self.adapter, "execute_macro", return_value=results) as macro:
+            relations = self.adapter.list_relations_in_schemas(schemas)
+
+        macro.assert_called_once()
+        self.assertEqual(macro.call_args[0][0], "snowflake__list_relations_in_database")
+        self.assertEqual(
+            macro.call_args[1]["kwargs"]["database_relation"].render(), "test_database"
+        )
+        self.assertEqual(macro.call_args[1]["kwargs"]["max_results"], 20000)
+        self.assertEqual(
+            sorted((relation.schema, relation.identifier) for relation in relations),
+            [("SCHEMA_A", "TABLE_A"), ("SCHEMA_B", "VIEW_B")],
+        )
+
+    def test_list_relations_per_database_matches_quoted_schemas_exactly(self):
+        set_invocation_context({})
+        self.config.credentials = self.config.credentials.replace(list_relations_per_database=True)
+        schemas = [
+            self.adapter.Relation.create(
+                database="test_database", schema="My_Schema", quote_policy={"schema": True}
+            ),
+            self.adapter.Relation.create(database="test_database", schema="other_schema"),
+        ]
+        results = agate_helper.table_from_rows(
+            [
+                ("TEST_DATABASE", "My_Schema", "TABLE_A", "TABLE"),
+                ("TEST_DATABASE", "MY_SCHEMA", "TABLE_B", "TABLE"),
+                ("TEST_DATABASE", "OTHER_SCHEMA", "TABLE_C", "TABLE"),
+                ("TEST_DATABASE", "other_schema", "TABLE_D", "TABLE"),
+            ],
+            ("database_name", "schema_name", "name", "kind"),
+        )
+
+        with mock.patch.object(self.adapter, "execute_macro", return_value=results):
+            relations = self.adapter.list_relations_in_schemas(schemas)
+
+        self.assertEqual(
+            sorted((relation.schema, relation.identifier) for relation in relations),
+            [("My_Schema", "TABLE_A"), ("OTHER_SCHEMA", "TABLE_C")],
+        )
+
+    def test_list_relations_per_database_falls_back_to_schemas(self):
+        set_invocation_context({})
+        self.config.credentials = self.config.credentials.replace(list_relations_per_database=True)
+        schemas = [
+            self.adapter.Relation.create(database="test_database", schema=schema)
+            for schema in ("schema_a", "schema_b")
+        ]
+
+        with mock.patch.object(
+            self.adapter, "_list_relations_in_database", return_value=None
+        ), mock.patch.object(
+            self.adapter, "list_relations_without_caching", return_value=[]
+        ) as list_schema:
+            self.adapter.list_relations_in_schemas(schemas)
+
+        self.assertEqual(
+            sorted(call[0][0].schema for call in list_schema.call_args_list),
+            ["schema_a", "schema_b"],
+        )
+
+    @staticmethod
+    def _name_hash(name, kind):
+        return zlib.crc32(f"{name}.{kind}".encode())
+
+    def _relations_changed_since(self, rows, objects, watermark):
+        """The results of snowflake__get_relations_changed_since, for the changed rows of a
+        schema that holds `objects`, a list of names and kinds."""
+        fingerprint = 0
+        for name, kind in objects:
+            fingerprint ^= self._name_hash(name, kind)
+        return agate_helper.table_from_rows(
+            [(*row, self._name_hash(row[2], row[3]), None, None, None) for row in rows]
+            + [(None, None, None, None, None, None, len(objects), fingerprint, watermark)],
+            (
+                "database_name",
+                "schema_name",
+                "name",
+                "kind",
+                "is_dynamic",
+                "name_hash",
+                "object_count",
+                "fingerprint",
+                "watermark",
+            ),
+        )
+
+    def test_relation_cache_path(self):
+        set_invocation_context({})
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        relation_cache_path = os.path.join(tmp_dir.name, "relations.json")
+        self.config.credentials = self.config.credentials.replace(
+            relation_cache_path=relation_cache_path
+        )
+        schema = self.adapter.Relation.create(database="test_database", schema="my_schema")
+        first_watermark = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+        second_watermark = datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)
+
+        def listed(relations):
+            return sorted((relation.identifier, relation.type) for relation in relations)
+
+        # the first run lists everything
+        with mock.patch.object(
+            self.adapter,
+            "execute_macro",
+            return_value=self._relations_changed_since(
+                [
+                    ("TEST_DATABASE", "MY_SCHEMA", "TABLE_A", "TABLE", "N"),
+                    ("TEST_DATABASE", "MY_SCHEMA", "VIEW_B", "VIEW", "N"),
+                ],
+                [("TABLE_A", "TABLE"), ("VIEW_B", "VIEW")],
+                first_watermark,
+            ),
+        ) as macro:
+            relations = self.adapter.list_relations_in_schemas([schema])
+        self.assertEqual(macro.call_args[1]["kwargs"]["watermark"], None)
+        self.assertEqual(listed(relations), [("TABLE_A", "table"), ("VIEW_B", "view")])
+
+        # the next run only fetches what changed
+        with mock.patch.object(
+            self.adapter,
+            "execute_macro",
+            return_value=self._relations_changed_since(
+                [("TEST_DATABASE", "MY_SCHEMA", "TABLE_C", "TABLE", "Y")],
+                [("TABLE_A", "TABLE"), ("VIEW_B", "VIEW"), ("TABLE_C", "TABLE")],
+                second_watermark,
+            ),
+        ) as macro:
+            relations = self.adapter.list_relations_in_schemas([schema])
+        macro.assert_called_once()
+        self.assertEqual(macro.call_args[1]["kwargs"]["watermark"], first_watermark.isoformat())
+        self.assertEqual(
+            listed(relations),
+            [("TABLE_A", "table"), ("TABLE_C", "dynamic_table"), ("VIEW_B", "view")],
+        )
+
+        # a dropped object makes the counts disagree, so everything is listed again
+        with mock.patch.object(
+            self.adapter,
+            "execute_macro",
+            side_effect=[
+                self._relations_changed_since(
+                    [], [("TABLE_A", "TABLE"), ("TABLE_C", "TABLE")], second_watermark
+                ),
+                self._relations_changed_since(
+                    [
+                        ("TEST_DATABASE", "MY_SCHEMA", "TABLE_A", "TABLE", "N"),
+                        ("TEST_DATABASE", "MY_SCHEMA", "TABLE_C", "TABLE", "Y"),
+                    ],
+                    [("TABLE_A", "TABLE"), ("TABLE_C", "TABLE")],
+                    second_watermark,
+                ),
+            ],
+        ) as macro:
+            relations = self.adapter.list_relations_in_schemas([schema])
+        self.assertEqual(macro.call_args[1]["kwargs"]["watermark"], None)
+        self.assertEqual(listed(relations), [("TABLE_A", "table"), ("TABLE_C", "dynamic_table")])
+
+        # a dropped object that an undropped one makes up for keeps the count, but not the
+        # fingerprint, so everything is listed again
+        objects = [("TABLE_A", "TABLE"), ("TABLE_D", "TABLE")]
+        with mock.patch.object(
+            self.adapter,
+            "execute_macro",
+            side_effect=[
+                self._relations_changed_since([], objects, second_watermark),
+                self._relations_changed_since(
+                    [
+                        ("TEST_DATABASE", "MY_SCHEMA", "TABLE_A", "TABLE", "N"),
+                        ("TEST_DATABASE", "MY_SCHEMA", "TABLE_D", "TABLE", "N"),
+                    ],
+                    objects,
+                    second_watermark,
+                ),
+            ],
+        ) as macro:
+            relations = self.adapter.list_relations_in_schemas([schema])
+        self.assertEqual(macro.call_count, 2)
+        self.assertEqual(listed(relations), [("TABLE_A", "table"), ("TABLE_D", "table")])
+
+    def test_relation_cache_path_types_match_show_objects(self):
+        set_invocation_context({})
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.config.credentials = self.config.credentials.replace(
+            relation_cache_path=os.path.join(tmp_dir.name, "relations.json")
+        )
+        schema = self.adapter.Relation.create(database="test_database", schema="my_schema")
+        # the kinds snowflake__get_relations_changed_since derives from information_schema
+        objects = [
+            ("TABLE_A", "TABLE", "N"),
+            ("TABLE_B", "TABLE", "Y"),
+            ("VIEW_C", "VIEW", "N"),
+            ("VIEW_D", "MATERIALIZED_VIEW", "N"),
+            ("TABLE_E", "EXTERNAL_TABLE", "N"),
+        ]
+        rows = [("TEST_DATABASE", "MY_SCHEMA", *obj) for obj in objects]
+
+        with mock.patch.object(
+            self.adapter,
+            "execute_macro",
+            return_value=self._relations_changed_since(
+                rows, [obj[:2] for obj in objects], datetime.datetime(2024, 1, 1)
+            ),
+        ):
+            cached = self.adapter.list_relations_in_schemas([schema])
+        listed = self.adapter._parse_list_relations_results(
+            agate_helper.table_from_rows(
+                rows, ("database_name", "schema_name", "name", "kind", "is_dynamic")
+            )
+        )
+
+        self.assertEqual(
+            sorted((relation.identifier, relation.type) for relation in cached),
+            sorted((relation.identifier, relation.type) for relation in listed),
+        )
+        self.assertEqual(
+            sorted((relation.identifier, relation.type) for relation in cached),
+            [
+                ("TABLE_A", "table"),
+                ("TABLE_B", "dynamic_table"),
+                ("TABLE_E", "external"),
+                ("VIEW_C", "view"),
+                ("VIEW_D", "external"),
+            ],
+        )
+
+    def test_catalog_cache_path(self):
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        self.config.credentials = self.config.credentials.replace(catalog_cache_path=tmp_dir.name)
+        information_schema = self.adapter.Relation.create(
+            database="test_database", schema="my_schema"
+        ).information_schema()
+        used_schemas = frozenset({("test_database", "my_schema")})
+        column_names = (
+            "table_database",
+            "table_schema",
+            "table_name",
+            "column_name",
+            "column_index",
+            "column_type",
+            "table_created",
+        )
+        created = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+
+        def last_altered(*tables):
+            return agate_helper.table_from_rows(
+                [("MY_SCHEMA", *table) for table in tables],
+                ("table_schema", "table_name", "last_altered"),
+            )
+
+        def catalog(*rows):
+            return agate_helper.table_from_rows(
+                [("TEST_DATABASE", "MY_SCHEMA", *row, created) for row in rows], column_names
+            )
+
+        def get_catalog(results):
+            with mock.patch.object(self.adapter, "execute_macro", side_effect=results) as macro:
+                table = self.adapter._get_one_catalog(
+                    information_schema, {"my_schema"}, used_schemas
+                )
+            macros = [call[0][0] for call in macro.call_args_list]
+            return sorted((row["table_name"], row["column_name"]) for row in table), macros
+
+        # the first run gets the whole catalog
+        rows, macros = get_catalog(
+            [
+                last_altered(("TABLE_A", "2024-01-01"), ("TABLE_B", "2024-01-01")),
+                catalog(("TABLE_A", "ID", 1, "NUMBER"), ("TABLE_B", "ID", 1, "NUMBER")),
+            ]
+        )
+        self.assertEqual(macros, ["snowflake__get_catalog_last_altered", "get_catalog"])
+        self.assertEqual(rows, [("TABLE_A", "ID"), ("TABLE_B", "ID")])
+
+        # the next run only gets the tables altered since, and drops the dropped ones
+        rows, macros = get_catalog(
+            [
+                last_altered(("TABLE_A", "2024-01-02"), ("TABLE_C", "2024-01-02")),
+                catalog(("TABLE_A", "NAME", 2, "TEXT"), ("TABLE_C", "ID", 1, "NUMBER")),
+            ]
+        )
+        self.assertEqual(macros, ["snowflake__get_catalog_last_altered", "get_catalog_relations"])
+        self.assertEqual(rows, [("TABLE_A", "NAME"), ("TABLE_C", "ID")])
+
+        # nothing changed, so only the tables are listed
+        rows, macros = get_catalog(
+            [last_altered(("TABLE_A", "2024-01-02"), ("TABLE_C", "2024-01-02"))]
+        )
+        self.assertEqual(macros, ["snowflake__get_catalog_last_altered"])
+        self.assertEqual(rows, [("TABLE_A", "NAME"), ("TABLE_C", "ID")])
+
+        # the stored rows have the same values and types as a catalog without the cache
+        with mock.patch.object(
+            self.adapter,
+            "execute_macro",
+            return_value=last_altered(("TABLE_A", "2024-01-02"), ("TABLE_C", "2024-01-02")),
+        ):
+            cached = self.adapter._get_one_catalog(information_schema, {"my_schema"}, used_schemas)
+        cold = self.adapter._catalog_filter_table(
+            catalog(("TABLE_A", "NAME", 2, "TEXT"), ("TABLE_C", "ID", 1, "NUMBER")), used_schemas
+        )
+        self.assertEqual(
+            [type(column.data_type) for column in cached.columns],
+            [type(column.data_type) for column in cold.columns],
+        )
+        self.assertEqual(sorted(tuple(row) for row in cached), sorted(tuple(row) for row in cold))
+        self.assertEqual(cached[0]["table_created"], created)
+
+        # tables created with quoted lower case names are fetched by their exact name
+        with mock.patch.object(
+            self.adapter,
+            "execute_macro",
+            side_effect=[
+                last_altered(
+                    ("TABLE_A", "2024-01-02"), ("TABLE_C", "2024-01-02"), ("quoted", "2024-01-03")
+                ),
+                catalog(("quoted", "ID", 1, "NUMBER")),
+            ],
+        ) as macro:
+            table = self.adapter._get_one_catalog(information_schema, {"my_schema"}, used_schemas)
+        (relation,) = macro.call_args_list[1][1]["kwargs"]["relations"]
+        self.assertEqual((relation.schema, relation.identifier), ("MY_SCHEMA", "quoted"))
+        self.assertTrue(relation.quote_policy.schema and relation.quote_policy.identifier)
+        self.assertIn(("quoted", "ID"), [(row["table_name"], row["column_name"]) for row in table])
+
+    def test_get_catalog_by_relations_in_chunks(self):
+        set_invocation_context({})
+        self.adapter.CATALOG_RELATIONS_CHUNK_SIZE = 2
+        relations = {
+            self.adapter.Relation.create(
+                database=database, schema="my_schema", identifier=f"table_{i}"
+            )
+            for database, count in (("database_a", 5), ("database_b", 1))
+            for i in range(count)
+        }
+        column_names = ("table_database", "table_schema", "table_name")
+
+        def catalog(information_schema, chunk, used_schemas):
+            return agate_helper.table_from_rows(
+                [(r.database, r.schema, r.identifier) for r in chunk], column_names
+            )
+
+        with mock.patch.object(
+            self.adapter, "_get_one_catalog_by_relations", side_effect=catalog
+        ) as get_one_catalog:
+            table, exceptions = self.adapter.get_catalog_by_relations(frozenset(), relations)
+
+        self.assertEqual(exceptions, [])
+        self.assertEqual(
+            sorted([r.identifier for r in call[0][1]] for call in get_one_catalog.call_args_list),
+            [["table_0"], ["table_0", "table_1"], ["table_2", "table_3"], ["table_4"]],
+        )
+        self.assertEqual(len(table), 6)
+
+    def test_get_catalog_for_relations(self):
+        set_invocation_context({})
+        relations = [
+            self.adapter.Relation.create(database="test_database", schema=schema, identifier=name)
+            for schema, name in (
+                ("schema_a", "table_a"),
+                ("schema_a", "view_a"),
+                ("schema_a", "missing"),
+                ("schema_b", "table_b"),
+            )
+        ]
+        objects = {
+            "SCHEMA_A": [("TABLE_A", "TABLE", 10), ("VIEW_A", "VIEW", None)],
+            "SCHEMA_B": [("TABLE_B", "TABLE", 20)],
+        }
+        columns = agate_helper.table_from_rows(
+            [
+                ("TEST_DATABASE", "SCHEMA_A", "TABLE_A", "ID", 1, "NUMBER"),
+                ("TEST_DATABASE", "SCHEMA_A", "TABLE_A", "NAME", 2, "TEXT"),
+                ("TEST_DATABASE", "SCHEMA_A", "VIEW_A", "ID", 1, "NUMBER"),
+                ("TEST_DATABASE", "SCHEMA_B", "TABLE_B", "ID", 1, "NUMBER"),
+            ],
+            (
+                "table_database",
+                "table_schema",
+                "table_name",
+                "column_name",
+                "column_index",
+                "column_type",
+            ),
+        )
+
+        def execute_macro(macro_name, kwargs):
+            if macro_name == "snowflake__get_columns_in_relations":
+                return columns
+            schema = kwargs["schema_relation"].schema
+            return agate_helper.table_from_rows(
+                [
+                    ("TEST_DATABASE", schema, name, kind, rows, None, None)
+                    for name, kind, rows in objects[schema]
+                ],
+                ("database_name", "schema_name", "name", "kind", "rows", "bytes", "comment"),
+            )
+
+        with mock.patch.object(self.adapter, "execute_macro", side_effect=execute_macro) as macro:
+            catalogs = self.adapter.get_catalog_for_relations(relations)
+
+        # one listing per schema and one columns query for the database
+        self.assertEqual(
+            sorted(call[0][0] for call in macro.call_args_list),
+            [
+                "list_relations_without_caching",
+                "list_relations_without_caching",
+                "snowflake__get_columns_in_relations",
+            ],
+        )
+        table_a, view_a, missing, table_b = (catalogs[relation] for relation in relations)
+        self.assertIsNone(missing)
+        self.assertEqual(table_a.metadata.type, "TABLE")
+        self.assertEqual(list(table_a.columns), ["ID", "NAME"])
+        self.assertEqual(table_a.stats["row_count"].value, 10)
+        self.assertEqual(view_a.metadata.type, "VIEW")
+        self.assertFalse(view_a.stats["row_count"].include)
+        self.assertEqual(table_b.metadata.schema, "SCHEMA_B")
+        self.assertEqual(list(table_b.columns), ["ID"])
+
+    def test_get_catalog_for_relations_of_missing_schema(self):
+        set_invocation_context({})
+        relation = self.adapter.Relation.create(
+            database="test_database", schema="missing_schema", identifier="my_table"
+        )
+        missing = DbtDatabaseError(
+            "002003 (02000): SQL compilation error:\n"
+            "Schema 'TEST_DATABASE.MISSING_SCHEMA' does not exist or not authorized."
+        )
+
+        with mock.patch.object(self.adapter, "execute_macro", side_effect=missing) as macro:
+            catalogs = self.adapter.get_catalog_for_relations([relation])
+
+        macro.assert_called_once()
+        self.assertEqual(catalogs, {relation: None})
+
+    def test_get_catalog_for_relations_raises_other_errors(self):
+        set_invocation_context({})
+        relation = self.adapter.Relation.create(
+            database="test_database", schema="test_schema", identifier="my_table"
+        )
+        error = DbtDatabaseError("000630 (57014): Statement reached its statement timeout")
+
+        with mock.patch.object(self.adapter, "execute_macro", side_effect=error):
+            with self.assertRaises(DbtDatabaseError):
+                self.adapter.get_catalog_for_relations([relation])
+
+    def test_get_columns_in_relation_is_cached_until_altered(self):
+        relation = self.adapter.Relation.create(
+            database="test_database", schema="test_schema", identifier="my_table"
+        )
+        columns = [SnowflakeColumn("ID", "NUMBER")]
+
+        with mock.patch(
+            "dbt.adapters.sql.SQLAdapter.get_columns_in_relation", return_value=columns
+        ) as describe:
+            self.assertEqual(self.adapter.get_columns_in_relation(relation), columns)
+            self.assertEqual(self.adapter.get_columns_in_relation(relation), columns)
+            self.assertEqual(describe.call_count, 1)
+
+            self.adapter.execute("alter table test_database.test_schema.other add column b int")
+            self.adapter.get_columns_in_relation(relation)
+            self.assertEqual(describe.call_count, 1)
+
+            self.adapter.execute('alter table "test_schema".MY_TABLE add column b int')
+            self.adapter.get_columns_in_relation(relation)
+            self.assertEqual(describe.call_count, 2)
+
+            self.adapter.execute("call my_procedure()")
+            self.adapter.get_columns_in_relation(relation)
+            self.assertEqual(describe.call_count, 3)
+
+    def test_calculate_freshness_from_metadata_batch_in_chunks(self):
+        set_invocation_context({})
+        self.adapter.LAST_MODIFIED_CHUNK_SIZE = 2
+        sources = [
+            self.adapter.Relation.create(database="test_database", schema=schema, identifier=name)
+            for schema, name in (
+                ("schema_b", "table_c"),
+                ("schema_a", "table_a"),
+                ("schema_a", "table_b"),
+            )
+        ]
+        snapshotted_at = datetime.datetime(2024, 1, 2, tzinfo=datetime.timezone.utc)
+        last_modified = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+        def last_modified_macro(macro_name, kwargs, macro_resolver, needs_conn):
+            table = agate_helper.table_from_rows(
+                [
+                    (r.schema.upper(), r.identifier.upper(), last_modified, snapshotted_at)
+                    for r in kwargs["relations"]
+                ],
+                ("schema", "identifier", "last_modified", "snapshotted_at"),
+            )
+            return mock.Mock(response=mock.sentinel.response, table=table)
+
+        with mock.patch.object(
+            self.adapter, "execute_macro", side_effect=last_modified_macro
+        ) as macro:
+            responses, freshness = self.adapter.calculate_freshness_from_metadata_batch(sources)
+
+        self.assertEqual(
+            sorted(
+                [(r.schema, r.identifier) for r in call[1]["kwargs"]["relations"]]
+                for call in macro.call_args_list
+            ),
+            [[("schema_a", "table_a"), ("schema_a", "table_b")], [("schema_b", "table_c")]],
+        )
+        self.assertEqual(responses, [mock.sentinel.response] * 2)
+        self.assertEqual(set(freshness), set(sources))
+        self.assertEqual(freshness[sources[0]]["age"], 86400)
+
+    def test_pool_connections(self):
+        self.config.credentials = self.config.credentials.replace(pool_connections=True)
+        pool = SnowflakeConnectionPool()
+
+        with mock.patch("dbt.adapters.snowflake.connections.CONNECTION_POOL", pool):
+            # start over with a connection that has the new credentials
+            self.adapter.cleanup_connections()
+            self.adapter.acquire_connection("first")
+            self.adapter.execute("select 1")
+            self.adapter.release_connection()
+            # a connection released by any thread is reused without opening a new session
+            self.adapter.acquire_connection("other")
+            self.adapter.execute("select 2")
+            self.assertEqual(self.snowflake.call_count, 1)
+            self.assertEqual((pool.stats.hits, pool.stats.misses), (1, 1))
+
+            # the session stays open in the pool after the adapter is cleaned up
+            self.adapter.cleanup_connections()
+            self.handle.close.assert_not_called()
+            pool.close_all()
+            self.handle.close.assert_called_once()
+
+    def test_pool_connections_with_query_tags(self):
+        self.config.credentials = self.config.credentials.replace(pool_connections=True)
+        self.cursor.description = [("key", 2), ("value", 2)]
+        self.cursor.fetchall.return_value = [("QUERY_TAG", "")]
+        pool = SnowflakeConnectionPool()
+
+        with mock.patch("dbt.adapters.snowflake.connections.CONNECTION_POOL", pool):
+            self.adapter.cleanup_connections()
+            for name in ("first", "second", "third"):
+                self.adapter.acquire_connection(name)
+                original_query_tag = self.adapter.set_query_tag("my_tag")
+                self.adapter.execute("select 1")
+                self.adapter.unset_query_tag(original_query_tag)
+                # restoring the tag is left to the next statement on the pooled session
+                self.adapter.release_connection()
+
+            self.assertEqual(self.snowflake.call_count, 1)
+            self.assertEqual((pool.stats.hits, pool.stats.misses), (2, 1))
+            self.handle.close.assert_not_called()
+            self.assertEqual(self.mock_execute.call_count, 5)
+
+            # a model without a tag gets a session with the tag of the credentials
+            self.adapter.acquire_connection("untagged")
+            self.adapter.execute("select 2")
+            self.mock_execute.assert_has_calls(
+                [
+                    mock.call("/* dbt */\nalter session unset query_tag", None),
+                    mock.call("/* dbt */\nselect 2", None),
+                ]
+            )
+            self.adapter.cleanup_connections()
+            pool.close_all()
+
+    def test_pool_connections_closes_changed_sessions(self):
+        self.config.credentials = self.config.credentials.replace(pool_connections=True)
+        pool = SnowflakeConnectionPool()
+
+        with mock.patch("dbt.adapters.snowflake.connections.CONNECTION_POOL", pool):
+            self.adapter.cleanup_connections()
+            self.adapter.acquire_connection("first")
+            self.adapter.execute("use warehouse other_warehouse")
+            self.adapter.release_connection()
+
+            self.handle.close.assert_called_once()
+            self.assertIsNone(pool.checkout(self.config.credentials.pool_key()))
+
+    def test_pool_connections_closes_sessions_of_unknown_state(self):
+        self.config.credentials = self.config.credentials.replace(pool_connections=True)
+        pool = SnowflakeConnectionPool()
+
+        with mock.patch("dbt.adapters.snowflake.connections.CONNECTION_POOL", pool):
+            self.adapter.cleanup_connections()
+            self.adapter.acquire_connection("first")
+            self.mock_execute.side_effect = snowflake_connector.errors.ProgrammingError()
+            # the role may or may not have changed
+            with self.assertRaises(DbtRuntimeError):
+                self.adapter.execute("use role other_role")
+            self.adapter.release_connection()
+
+            self.handle.close.assert_called_once()
+            self.assertIsNone(pool.checkout(self.config.credentials.pool_key()))
+
+    def test_prewarm_connections(self):
+        self.config.credentials = self.config.credentials.replace(
+            pool_connections=True, prewarm_connections=2
+        )
+        pool = SnowflakeConnectionPool()
+
+        with mock.patch("dbt.adapters.snowflake.connections.CONNECTION_POOL", pool):
+            with mock.patch.object(self.config.args, "which", "run", create=True):
+                adapter = SnowflakeAdapter(self.config, get_context("spawn"))
+                adapter.set_macro_resolver(self.adapter.get_macro_resolver())
+                # no session is opened before one is needed
+                self.assertEqual(self.snowflake.call_count, 0)
+                adapter.acquire_connection("first")
+                adapter.execute("select 1")
+                # waits for the other session being prewarmed
+                self.assertIsNotNone(pool.checkout(self.config.credentials.pool_key()))
+                adapter.cleanup_connections()
+                pool.close_all()
+
+        self.assertEqual(self.snowflake.call_count, 2)
+        self.assertEqual((pool.stats.prewarmed, pool.stats.hits, pool.stats.misses), (2, 2, 0))
+
+    def test_prewarm_connections_skipped_for_other_commands(self):
+        self.config.credentials = self.config.credentials.replace(
+            pool_connections=True, prewarm_connections=2
+        )
+        pool = SnowflakeConnectionPool()
+
+        with mock.patch("dbt.adapters.snowflake.connections.CONNECTION_POOL", pool):
+            with mock.patch.object(self.config.args, "which", "compile", create=True):
+                adapter = SnowflakeAdapter(self.config, get_context("spawn"))
+                adapter.acquire_connection("first")
+                adapter.cleanup_connections()
+
+        self.assertEqual(pool.stats.prewarmed, 0)
+
+    def test_multi_statement_execution(self):
+        self.config.credentials = self.config.credentials.replace(multi_statement_execution=True)
+        self.cursor.sqlstate = None
+        self.cursor.rowcount = 1
+        self.cursor.sfqid = "01b2c3d4"
+
+        self.adapter.execute("create table my_table (id int);\ninsert into my_table values (1);")
+
+        self.mock_execute.assert_called_once_with(
+            "/* dbt */\ncreate table my_table (id int);\n"
+            "/* dbt */\ninsert into my_table values (1);",
+            num_statements=2,
+        )
+        self.assertEqual(self.cursor.nextset.call_count, 1)
+
+    def test_multi_statement_execution_returns_the_dml_response(self):
+        self.config.credentials = self.config.credentials.replace(multi_statement_execution=True)
+
+        def cursor():
+            cursor = mock.MagicMock()
+            cursor.sqlstate = None
+            cursor.sfqid = "01b2c3d4"
+
+            def execute(sql, *args, num_statements=None):
+                cursor.rowcount = 0 if num_statements is None else 3
+
+            def nextset():
+                cursor.rowcount = 5
+
+            cursor.execute.side_effect = execute
+            cursor.nextset.side_effect = nextset
+            return cursor
+
+        self.handle.cursor.side_effect = cursor
+
+        response, _ = self.adapter.execute(
+            "begin;\ndelete from my_table;\nupdate my_table set id = 1;\ncommit;"
+        )
+
+        # begin and commit run on their own, the result is the one of the last DML
+        self.assertEqual(self.handle.cursor.call_count, 3)
+        self.assertEqual(response.rows_affected, 5)
+
+    def test_multi_statement_execution_not_used_with_bindings(self):
+        self.config.credentials = self.config.credentials.replace(multi_statement_execution=True)
+
+        self.adapter.connections.add_query("select %s;\nselect 2;", bindings=[1])
+
+        self.mock_execute.assert_has_calls(
+            [
+                mock.call("/* dbt */\nselect %s;", (1,)),
+                mock.call("/* dbt */\nselect 2;", (1,)),
+            ]
+        )
+        self.cursor.nextset.assert_not_called()
+
+    @mock.patch("dbt.adapters.snowflake.connections.sleep")
+    def test_reattach_polls_with_backoff(self, mock_sleep):
+        self.mock_execute.side_effect = snowflake_connector.errors.GatewayTimeoutError()
+        self.cursor.sfqid = "01b2c3d4"
+        self.handle.is_closed.return_value = False
+        self.handle.get_query_status_throw_if_error.side_effect = [
+            snowflake_connector.errors.ServiceUnavailableError(),
+            *[mock.sentinel.status] * 7,
+        ]
+        self.handle.is_still_running.side_effect = [True] * 6 + [False]
+
+        self.adapter.connections.add_query("create table my_table as select 1 as id")
+
+        # transient errors while checking on the query are retried
+        self.assertEqual(
+            mock_sleep.call_args_list,
+            [mock.call(interval) for interval in (0.1, 0.2, 0.4, 0.8, 1.0, 1.0, 1.0)],
+        )
+        self.cursor.query_result.assert_called_once_with("01b2c3d4")
+
+    @mock.patch("dbt.adapters.snowflake.connections.sleep")
+    def test_reattach_after_lost_connection(self, mock_sleep):
+        # the connector builds errors of failed HTTP requests from the status code alone
+        self.mock_execute.side_effect = snowflake_connector.errors.GatewayTimeoutError()
+        self.cursor.sfqid = "01b2c3d4"
+        self.handle.is_closed.return_value = True
+        self.handle.is_still_running.side_effect = [True, False]
+        self.adapter.connections.set_connection_name("model")
+
+        self.adapter.connections.add_query("create table my_table as select 1 as id")
+
+        self.mock_execute.assert_called_once()
+        # the lost connection is reopened to check on the query instead of running it again
+        self.assertEqual(self.snowflake.call_count, 2)
+        self.handle.get_query_status_throw_if_error.assert_called_with("01b2c3d4")
+        self.cursor.query_result.assert_called_once_with("01b2c3d4")
+
+    def test_no_reattach_without_query_id(self):
+        self.mock_execute.side_effect = snowflake_connector.errors.GatewayTimeoutError()
+        self.cursor.sfqid = None
+
+        with self.assertRaises(DbtRuntimeError):
+            self.adapter.connections.add_query("select 1")
+
+        self.handle.get_query_status_throw_if_error.assert_not_called()
+
     def test_cancel_open_connections_empty(self):
         self.assertEqual(len(list(self.adapter.cancel_open_connections())), 0)
 